@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Build script to generate the Ice Time Track landing page
+Run with: python3 build.py [--force]
+(or python3 ../build.py to build every app at once)
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from sitegen import main, page_url  # noqa: E402
+from sitegen.templates import load_template, render  # noqa: E402
+
+BASE_URL = 'https://masawata.net/IceTimeTrack'
+
+# English only for now; the copy lives in templates/index.html
+LANGUAGES = [
+    {'code': 'en', 'name': 'English', 'dir': ''},
+]
+
+# No sitemap.xml (the hand-written page never had one)
+SITEMAP = False
+
+
+TEMPLATES_DIR = os.path.join(SCRIPT_DIR, 'templates')
+
+# Locale-invariant values folded into the templates at compile time
+CONSTANTS = {
+    'BASE_URL': BASE_URL,
+}
+
+PAGE_TEMPLATE = load_template(os.path.join(TEMPLATES_DIR, 'index.html'), CONSTANTS)
+
+
+def load_translation(lang_code):
+    return {}
+
+
+def generate_html(lang, translations):
+    context = {
+        'canonical_url': page_url(BASE_URL, lang),
+    }
+    return render(PAGE_TEMPLATE, context)
+
+
+if __name__ == '__main__':
+    main(app_names=[os.path.basename(SCRIPT_DIR)])
@@ -9,6 +9,7 @@
     // ===== Locale Detection & Persistence =====
     const SUPPORTED_LOCALES = ['en', 'ja', 'ko', 'zh-Hans', 'zh-Hant', 'fr', 'de', 'es', 'pt', 'it', 'ru', 'hi', 'id', 'vi'];
     const LOCALE_STORAGE_KEY = 'preferred-locale';
+    const LOCALE_COOKIE = 'preferred_locale'; // read by the server/edge routing rules (sitegen/routing.py)
     const BASE_PATH = '/WhereWasI';
 
     function getCurrentLocale() {
@@ -34,11 +35,16 @@
         }
         // Special handling for Chinese variants
         if (userLang.startsWith('zh')) {
-            return userLang.includes('TW') || userLang.includes('HK') ? 'zh-Hant' : 'zh-Hans';
+            return /^zh-(?:.*-)?(?:hant|tw|hk|mo)\b/i.test(userLang) ? 'zh-Hant' : 'zh-Hans';
         }
         return 'en';
     }
 
+    function savePreferredLocale(locale) {
+        localStorage.setItem(LOCALE_STORAGE_KEY, locale);
+        document.cookie = LOCALE_COOKIE + '=' + locale + '; path=/; max-age=31536000; SameSite=Lax';
+    }
+
     function redirectToLocale(locale) {
         if (locale === 'en') {
             window.location.href = BASE_PATH + '/';
@@ -52,6 +58,11 @@
         const savedLocale = localStorage.getItem(LOCALE_STORAGE_KEY);
         const path = window.location.pathname;
 
+        // Mirror choices saved before the cookie existed
+        if (savedLocale && document.cookie.indexOf(LOCALE_COOKIE + '=') === -1) {
+            savePreferredLocale(savedLocale);
+        }
+
         // Enforce trailing slash for locale pages
         // This fixes issues where relative links (../) break out of the app directory
         if (currentLocale !== 'en' && !path.endsWith('/')) {
@@ -62,7 +73,7 @@
         // Prevent redirect if we are already on a specific language page
         if (currentLocale !== 'en') {
             if (savedLocale !== currentLocale) {
-                localStorage.setItem(LOCALE_STORAGE_KEY, currentLocale);
+                savePreferredLocale(currentLocale);
             }
             return;
         }
@@ -77,12 +88,12 @@
             // First visit - detect locale and redirect if needed
             const detectedLocale = detectUserLocale();
             if (detectedLocale !== currentLocale) {
-                localStorage.setItem(LOCALE_STORAGE_KEY, detectedLocale);
+                savePreferredLocale(detectedLocale);
                 redirectToLocale(detectedLocale);
                 return;
             }
             // Save current locale as preference
-            localStorage.setItem(LOCALE_STORAGE_KEY, currentLocale);
+            savePreferredLocale(currentLocale);
         }
     }
 
@@ -162,7 +173,7 @@
                     locale = 'en';
                 }
 
-                localStorage.setItem(LOCALE_STORAGE_KEY, locale);
+                savePreferredLocale(locale);
                 redirectToLocale(locale); // Use absolute path navigation
             });
         });
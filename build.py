@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+Build script to generate the localized pages of every app site
+Run with: python3 build.py [APP ...] [--force] [--jobs N]
+"""
+
+from sitegen import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+// Generated by sitegen/routing.py from each app's LANGUAGES - do not edit
+// Redirects the default page of each app to the visitor's locale on the first request.
+
+const COOKIE = "preferred_locale";
+const DEFAULT_LOCALE = "en";
+const ROUTES = {
+  "/FitnessStory/": {
+    "locales": {
+      "zh-Hans": "zh-Hans",
+      "zh-Hant": "zh-Hant",
+      "ja": "ja",
+      "ko": "ko",
+      "fr": "fr",
+      "de": "de",
+      "es": "es",
+      "pt": "pt",
+      "it": "it",
+      "ru": "ru",
+      "hi": "hi",
+      "id": "id",
+      "vi": "vi"
+    },
+    "patterns": [
+      "^\\s*zh\\-Hans(?:[,;]|$)",
+      "^\\s*zh\\-Hant(?:[,;]|$)",
+      "^\\s*ja(?:[,;]|$)",
+      "^\\s*ko(?:[,;]|$)",
+      "^\\s*fr(?:[,;]|$)",
+      "^\\s*de(?:[,;]|$)",
+      "^\\s*es(?:[,;]|$)",
+      "^\\s*pt(?:[,;]|$)",
+      "^\\s*it(?:[,;]|$)",
+      "^\\s*ru(?:[,;]|$)",
+      "^\\s*hi(?:[,;]|$)",
+      "^\\s*id(?:[,;]|$)",
+      "^\\s*vi(?:[,;]|$)",
+      "^\\s*zh-(?:[^,;]*-)?(?:hant|tw|hk|mo)\\b",
+      "^\\s*zh(?:-|(?:[,;]|$))",
+      "^\\s*ja-",
+      "^\\s*ko-",
+      "^\\s*fr-",
+      "^\\s*de-",
+      "^\\s*es-",
+      "^\\s*pt-",
+      "^\\s*it-",
+      "^\\s*ru-",
+      "^\\s*hi-",
+      "^\\s*id-",
+      "^\\s*vi-"
+    ],
+    "dirs": [
+      "zh-Hans",
+      "zh-Hant",
+      "ja",
+      "ko",
+      "fr",
+      "de",
+      "es",
+      "pt",
+      "it",
+      "ru",
+      "hi",
+      "id",
+      "vi",
+      "zh-Hant",
+      "zh-Hans",
+      "ja",
+      "ko",
+      "fr",
+      "de",
+      "es",
+      "pt",
+      "it",
+      "ru",
+      "hi",
+      "id",
+      "vi"
+    ]
+  },
+  "/WhereWasI/": {
+    "locales": {
+      "zh-Hans": "zh-Hans",
+      "zh-Hant": "zh-Hant",
+      "ja": "ja",
+      "ko": "ko",
+      "fr": "fr",
+      "de": "de",
+      "es": "es",
+      "pt": "pt",
+      "it": "it",
+      "ru": "ru",
+      "hi": "hi",
+      "id": "id",
+      "vi": "vi"
+    },
+    "patterns": [
+      "^\\s*zh\\-Hans(?:[,;]|$)",
+      "^\\s*zh\\-Hant(?:[,;]|$)",
+      "^\\s*ja(?:[,;]|$)",
+      "^\\s*ko(?:[,;]|$)",
+      "^\\s*fr(?:[,;]|$)",
+      "^\\s*de(?:[,;]|$)",
+      "^\\s*es(?:[,;]|$)",
+      "^\\s*pt(?:[,;]|$)",
+      "^\\s*it(?:[,;]|$)",
+      "^\\s*ru(?:[,;]|$)",
+      "^\\s*hi(?:[,;]|$)",
+      "^\\s*id(?:[,;]|$)",
+      "^\\s*vi(?:[,;]|$)",
+      "^\\s*zh-(?:[^,;]*-)?(?:hant|tw|hk|mo)\\b",
+      "^\\s*zh(?:-|(?:[,;]|$))",
+      "^\\s*ja-",
+      "^\\s*ko-",
+      "^\\s*fr-",
+      "^\\s*de-",
+      "^\\s*es-",
+      "^\\s*pt-",
+      "^\\s*it-",
+      "^\\s*ru-",
+      "^\\s*hi-",
+      "^\\s*id-",
+      "^\\s*vi-"
+    ],
+    "dirs": [
+      "zh-Hans",
+      "zh-Hant",
+      "ja",
+      "ko",
+      "fr",
+      "de",
+      "es",
+      "pt",
+      "it",
+      "ru",
+      "hi",
+      "id",
+      "vi",
+      "zh-Hant",
+      "zh-Hans",
+      "ja",
+      "ko",
+      "fr",
+      "de",
+      "es",
+      "pt",
+      "it",
+      "ru",
+      "hi",
+      "id",
+      "vi"
+    ]
+  }
+};
+
+export function localeFor(path, acceptLanguage, cookie) {
+  const route = ROUTES[path];
+  if (!route || cookie === DEFAULT_LOCALE) return null;
+  if (cookie && Object.prototype.hasOwnProperty.call(route.locales, cookie)) return route.locales[cookie];
+  for (let i = 0; i < route.patterns.length; i++) {
+    if (new RegExp(route.patterns[i], 'i').test(acceptLanguage || '')) return route.dirs[i];
+  }
+  return null;
+}
+
+function readCookie(header, name) {
+  const match = (header || '').match(new RegExp('(?:^|;\\s*)' + name + '=([^;]*)'));
+  return match ? decodeURIComponent(match[1]) : null;
+}
+
+export default async function (request, context) {
+  const url = new URL(request.url);
+  const locale = localeFor(url.pathname, request.headers.get('accept-language'),
+                           readCookie(request.headers.get('cookie'), COOKIE));
+  if (locale) {
+    return new Response(null, {
+      status: 302,
+      headers: { Location: url.pathname + locale + '/', Vary: 'Accept-Language, Cookie' },
+    });
+  }
+  return context && context.next ? context.next() : fetch(request);
+}
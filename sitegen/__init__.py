@@ -0,0 +1,10 @@
+"""
+Shared site generator for the app landing pages
+
+Build the whole site with: python3 build.py
+"""
+
+from .assets import localized_asset, localized_images
+from .config import GOOGLE_ANALYTICS, LANGUAGE_NAMES, LANGUAGES, OG_LOCALES
+from .engine import build_site, main
+from .fragments import generate_hreflang_tags, generate_language_links, get_asset_path, page_url
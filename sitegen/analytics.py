@@ -0,0 +1,71 @@
+"""
+Deferred Google Analytics
+
+GOOGLE_ANALYTICS loads gtag.js with an async <script> at the top of <head>,
+so every visit fetches and runs it while the hero image and stylesheets are
+still loading. With --defer-analytics that tag is replaced by a small inline
+loader that adds the same script once, on whichever comes first:
+
+    - the browser going idle after the load event (requestIdleCallback, or a
+      timeout where it isn't supported)
+    - the visitor's first pointerdown, keydown, touchstart or scroll
+    - the page being hidden (tab switch, navigation away)
+
+The inline gtag() stub stays as it is: until gtag.js arrives, gtag() calls
+(the page's js/config commands and any event a script sends) queue in
+window.dataLayer, which gtag.js replays in order when it loads, so nothing is
+lost. python3 -m sitegen.analyticscheck verifies this on a local test page.
+"""
+
+import html as html_lib
+import json
+import re
+
+GTAG_RE = re.compile(r'([ \t]*)<script\b[^>]*\bsrc="(https://www\.googletagmanager\.com/gtag/js\?[^"]+)"[^>]*>'
+                     r'\s*</script>\n?', re.IGNORECASE)
+
+# requestIdleCallback timeout, and the delay after load where it's unsupported (ms)
+IDLE_TIMEOUT = 4000
+FALLBACK_DELAY = 2000
+
+LOADER = '''<script>
+  (function (src) {
+    var events = ['pointerdown', 'keydown', 'touchstart', 'scroll'];
+    var loaded = false;
+    function load() {
+      if (loaded) return;
+      loaded = true;
+      events.forEach(function (name) { removeEventListener(name, load, true); });
+      var script = document.createElement('script');
+      script.async = true;
+      script.src = src;
+      document.head.appendChild(script);
+    }
+    function idle() {
+      if (window.requestIdleCallback) requestIdleCallback(load, {timeout: %(idle_timeout)d});
+      else setTimeout(load, %(fallback_delay)d);
+    }
+    events.forEach(function (name) { addEventListener(name, load, {capture: true, passive: true}); });
+    document.addEventListener('visibilitychange', function () {
+      if (document.visibilityState === 'hidden') load();
+    });
+    if (document.readyState === 'complete') idle();
+    else addEventListener('load', idle);
+  })(%(src)s);
+</script>'''
+
+
+def loader(src, indent=''):
+    """Inline loader markup for the gtag.js URL src, each line prefixed with indent."""
+    script = LOADER % {'src': json.dumps(src), 'idle_timeout': IDLE_TIMEOUT, 'fallback_delay': FALLBACK_DELAY}
+    return ''.join(f'{indent}{line}\n' for line in script.splitlines())
+
+
+def defer_analytics(html):
+    """Replace a page's gtag.js <script> with the deferred loader; returns (html, whether it was found)."""
+    match = GTAG_RE.search(html)
+    if not match:
+        return html, False
+    indent, src = match.groups()
+    src = html_lib.unescape(src)
+    return html[:match.start()] + loader(src, indent) + html[match.end():], True
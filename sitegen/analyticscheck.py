@@ -0,0 +1,287 @@
+"""
+Local test page for the deferred Google Analytics loader
+
+Writes .build-cache/analytics-test/: page.html holds GOOGLE_ANALYTICS exactly
+as --defer-analytics emits it, except that the loader fetches stub-gtag.js,
+which handles dataLayer the way gtag.js does (it replays the queued commands,
+then takes over dataLayer.push). Each scenario loads the page with one
+trigger and checks that
+
+    - nothing is fetched before the trigger
+    - the trigger fetches the script exactly once, even with more interactions
+    - every gtag() call, queued before or after the script loaded, reaches it in order
+
+index.html runs every scenario in an iframe and shows the results; the same
+page runs under node with a minimal DOM (skipped when node is not installed).
+
+    python3 -m sitegen.analyticscheck            # run the scenarios under node
+    python3 -m sitegen.analyticscheck --serve    # open the test page in a browser
+"""
+
+import argparse
+import html as html_lib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from . import server
+from .analytics import GTAG_RE, defer_analytics
+from .config import GOOGLE_ANALYTICS, ROOT_DIR
+
+TEST_DIR = os.path.join(ROOT_DIR, '.build-cache', 'analytics-test')
+STUB_NAME = 'stub-gtag.js'
+
+# Events that load the script; 'idle' waits for requestIdleCallback and
+# 'timeout' for the fallback where it's unsupported
+TRIGGERS = ['idle', 'timeout', 'pointerdown', 'keydown', 'touchstart', 'scroll', 'hidden']
+
+STUB_SCRIPT = '''// Stands in for gtag.js: replays the commands queued so far, then handles new ones as they're pushed
+(function () {
+  window.gtagLoads = (window.gtagLoads || 0) + 1;
+  var received = window.gtagReceived = [];
+  function handle(args) { received.push(Array.prototype.slice.call(args)); }
+  dataLayer.forEach(handle);
+  var push = dataLayer.push;
+  dataLayer.push = function () {
+    Array.prototype.forEach.call(arguments, handle);
+    return push.apply(dataLayer, arguments);
+  };
+  if (window.onGtagLoad) window.onGtagLoad();
+})();
+'''
+
+SCENARIO_SCRIPT = '''<script>
+    var trigger = location.hash.slice(1) || 'pointerdown';
+    var expected = ['js', 'event:queued_before_trigger', 'event:queued_while_loading', 'event:after_load'];
+    var problems = [];
+    var reported = false;
+
+    function report() {
+      if (reported) return;
+      reported = true;
+      var received = (window.gtagReceived || []).map(function (args) {
+        return args[0] === 'js' ? 'js' : args[0] + ':' + args[1];
+      });
+      if (window.gtagLoads !== 1) problems.push('gtag.js loaded ' + (window.gtagLoads || 0) + ' times');
+      if (JSON.stringify(received) !== JSON.stringify(expected)) problems.push('received ' + received.join(', '));
+      parent.postMessage({trigger: trigger, ok: !problems.length, detail: problems.join('; ')}, '*');
+    }
+
+    gtag('event', 'queued_before_trigger');
+    // Only the trigger under test may load the script
+    if (trigger === 'timeout') window.requestIdleCallback = undefined;
+    else if (trigger !== 'idle') window.requestIdleCallback = function () {};
+
+    var interactions = ['pointerdown', 'keydown', 'touchstart', 'scroll', 'hidden'];
+    function interact(name) {
+      if (name === 'hidden') {
+        Object.defineProperty(document, 'visibilityState', {value: 'hidden', configurable: true});
+        document.dispatchEvent(new Event('visibilitychange'));
+      } else {
+        dispatchEvent(new Event(name));
+      }
+    }
+
+    window.onGtagLoad = function () {
+      gtag('event', 'after_load');
+      interactions.forEach(interact);
+      setTimeout(report, 200);
+    };
+    setTimeout(function () {
+      problems.push('gtag.js was not loaded');
+      report();
+    }, 8000);
+
+    addEventListener('load', function () {
+      if (window.gtagLoads) problems.push('gtag.js loaded before the trigger');
+      if (interactions.indexOf(trigger) !== -1) {
+        interact(trigger);
+        // More interactions while the script is on its way must not fetch it again
+        interactions.forEach(interact);
+      }
+      gtag('event', 'queued_while_loading');
+    });
+  </script>'''
+
+PAGE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <title>Deferred analytics scenario</title>
+  %(analytics)s
+  %(scenario)s
+</head>
+<body>
+  <p>Deferred analytics scenario (see index.html)</p>
+</body>
+</html>
+'''
+
+INDEX = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <title>Deferred analytics test</title>
+  <style>
+    body { font: 16px system-ui, sans-serif; margin: 2rem; }
+    iframe { display: none; }
+    .pass { color: #080; }
+    .fail { color: #c00; }
+  </style>
+</head>
+<body>
+  <h1>Deferred analytics test</h1>
+  <p id="summary">Running...</p>
+  <ul id="results"></ul>
+  <script>
+    var triggers = %(triggers)s;
+    var done = 0;
+    var failed = 0;
+    addEventListener('message', function (event) {
+      var result = event.data;
+      var item = document.createElement('li');
+      item.className = result.ok ? 'pass' : 'fail';
+      item.textContent = (result.ok ? 'PASS ' : 'FAIL ') + result.trigger + (result.detail ? ': ' + result.detail : '');
+      document.getElementById('results').appendChild(item);
+      done += 1;
+      failed += result.ok ? 0 : 1;
+      if (done === triggers.length) {
+        document.getElementById('summary').textContent = failed ? failed + ' scenarios failed' : 'All scenarios passed';
+        document.title = (failed ? 'FAIL' : 'PASS') + ' - Deferred analytics test';
+      }
+    });
+    triggers.forEach(function (trigger) {
+      var frame = document.createElement('iframe');
+      frame.src = 'page.html#' + trigger;
+      document.body.appendChild(frame);
+    });
+  </script>
+</body>
+</html>
+'''
+
+# Runs page.html's inline scripts once per trigger with just enough of the DOM for the loader
+NODE_RUNNER = r'''
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+const [page, triggers] = JSON.parse(process.argv[1]);
+const dir = path.dirname(page);
+const scripts = [...fs.readFileSync(page, 'utf8').matchAll(/<script>([\s\S]*?)<\/script>/g)].map(m => m[1]);
+
+function run(trigger) {
+  return new Promise(resolve => {
+    const timers = [];
+    class Target {
+      constructor() { this.listeners = []; }
+      addEventListener(type, fn, options) {
+        const capture = typeof options === 'object' ? !!options.capture : !!options;
+        this.listeners.push({type, fn, capture});
+      }
+      removeEventListener(type, fn, options) {
+        const capture = typeof options === 'object' ? !!options.capture : !!options;
+        this.listeners = this.listeners.filter(l => !(l.type === type && l.fn === fn && l.capture === capture));
+      }
+      dispatchEvent(event) {
+        this.listeners.filter(l => l.type === event.type).forEach(l => l.fn.call(this, event));
+      }
+    }
+    const document = new Target();
+    document.readyState = 'loading';
+    document.visibilityState = 'visible';
+    document.createElement = tagName => ({tagName});
+    document.head = {appendChild(element) {
+      const source = fs.readFileSync(path.join(dir, element.src), 'utf8');
+      timers.push(setTimeout(() => vm.runInContext(source, context), 10));
+    }};
+    const window = new Target();
+    const context = vm.createContext(window);
+    Object.assign(window, {
+      window, document, Event: class { constructor(type) { this.type = type; } },
+      location: {hostname: 'localhost', hash: '#' + trigger},
+      setTimeout: (fn, ms) => { const t = setTimeout(fn, ms); timers.push(t); return t; },
+      requestIdleCallback: fn => window.setTimeout(fn, 50),
+      parent: {postMessage(result) { timers.forEach(clearTimeout); resolve(result); }},
+      console,
+    });
+    for (const name of ['addEventListener', 'removeEventListener', 'dispatchEvent']) {
+      window[name] = window[name].bind(window);
+    }
+    scripts.forEach(script => vm.runInContext(script, context));
+    window.setTimeout(() => {
+      document.readyState = 'complete';
+      window.dispatchEvent(new window.Event('load'));
+    }, 0);
+  });
+}
+
+(async () => {
+  const results = [];
+  for (const trigger of triggers) results.push(await run(trigger));
+  console.log(JSON.stringify(results));
+})();
+'''
+
+
+def write_test_page():
+    """Write the test page; returns the path of its index.html."""
+    match = GTAG_RE.search(GOOGLE_ANALYTICS)
+    if not match:
+        raise ValueError('GOOGLE_ANALYTICS has no gtag.js <script> to defer')
+    html, _ = defer_analytics(GOOGLE_ANALYTICS + '\n')
+    src = html_lib.unescape(match.group(2))
+    page = PAGE % {'analytics': html.replace(json.dumps(src), json.dumps(STUB_NAME)).rstrip(),
+                   'scenario': SCENARIO_SCRIPT}
+    os.makedirs(TEST_DIR, exist_ok=True)
+    files = {'page.html': page, STUB_NAME: STUB_SCRIPT, 'index.html': INDEX % {'triggers': json.dumps(TRIGGERS)}}
+    for filename, content in files.items():
+        with open(os.path.join(TEST_DIR, filename), 'w', encoding='utf-8') as f:
+            f.write(content)
+    return os.path.join(TEST_DIR, 'index.html')
+
+
+def node_results(page):
+    """Run every scenario of page.html under node; None when node is not installed."""
+    if not shutil.which('node'):
+        return None
+    result = subprocess.run(['node', '-e', NODE_RUNNER, json.dumps([page, TRIGGERS])],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test the deferred Google Analytics loader')
+    parser.add_argument('--serve', action='store_true', help='serve the test page for a browser instead of running node')
+    parser.add_argument('--port', type=int, default=8000, metavar='PORT', help='port for --serve (default: 8000)')
+    args = parser.parse_args()
+
+    index = write_test_page()
+    if args.serve:
+        server.start_server(args.port)
+        url_path = os.path.relpath(index, ROOT_DIR).replace(os.sep, '/')
+        print(f'Analytics: open http://localhost:{args.port}/{url_path} (Ctrl+C to stop)')
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            return
+
+    results = node_results(os.path.join(TEST_DIR, 'page.html'))
+    if results is None:
+        print(f'Analytics: skipped - node is not installed; run with --serve to open {os.path.relpath(index, ROOT_DIR)}')
+        return
+    failures = [result for result in results if not result['ok']]
+    print(f'Analytics: {len(results) - len(failures)} of {len(results)} scenarios passed')
+    for result in failures:
+        print(f"  FAIL {result['trigger']}: {result['detail']}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
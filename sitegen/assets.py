@@ -0,0 +1,138 @@
+"""
+Asset index and locale fallback
+
+The files under an app's assets/ and images/ directories are listed once per
+build, so pages reference locale-specific assets that exist instead of
+guessing a URL and patching it up in the browser (an onerror handler costs a
+404 plus a second request). localized_asset() walks the locale's fallback
+chain, e.g. zh-Hant -> zh -> en, and returns the first asset that exists.
+
+Localized screenshots live in images/<lang>/ next to images/en/.
+localized_images() resolves every file of images/en/ for a locale, and files
+that are byte-identical across locales share one URL (the en copy when it is
+among them), so the deploy and browser caches hold one copy of the bytes.
+
+The index, and which files are shared, are part of each app's generator hash,
+so adding or removing an asset (say a new app-store-badge-ja.svg) re-renders
+the app's pages.
+"""
+
+import hashlib
+import os
+import re
+
+from . import config
+from .files import cached_file_hash
+
+ASSET_DIRS = ('assets', 'images')
+DEFAULT_LOCALE = 'en'
+
+# Copies the build writes next to the originals (fingerprints, minified
+# and precompressed files); directories starting with _ or . are skipped
+GENERATED_RE = re.compile(r'\.[0-9a-f]{8}\.\w+$|\.min\.\w+$|\.(?:gz|br)$')
+
+# Asset indexes and shared localized files found in this process, keyed by app directory
+_indexes = {}
+_shared = {}
+
+
+def reset():
+    """Forget the indexes of the previous build (files may have been added since)."""
+    _indexes.clear()
+    _shared.clear()
+
+
+def asset_index(app_dir):
+    """Return the set of asset paths an app ships, relative to the app with / separators."""
+    app_dir = os.path.abspath(app_dir)
+    if app_dir not in _indexes:
+        found = set()
+        for name in ASSET_DIRS:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(app_dir, name)):
+                dirnames[:] = [d for d in dirnames if not d.startswith(('_', '.'))]
+                rel_dir = os.path.relpath(dirpath, app_dir).replace(os.sep, '/')
+                found.update(f'{rel_dir}/{filename}' for filename in filenames if not GENERATED_RE.search(filename))
+        _indexes[app_dir] = frozenset(found)
+    return _indexes[app_dir]
+
+
+def index_hash(app_dir):
+    h = hashlib.sha256('\n'.join(sorted(asset_index(app_dir))).encode('utf-8'))
+    h.update(repr(sorted(shared_files(app_dir).items())).encode('utf-8'))
+    return h.hexdigest()
+
+
+def fallback_chain(lang_code):
+    """Locales to try for lang_code, most specific first: zh-Hant -> zh -> en."""
+    parts = lang_code.split('-')
+    chain = ['-'.join(parts[:i]) for i in range(len(parts), 0, -1)]
+    if DEFAULT_LOCALE not in chain:
+        chain.append(DEFAULT_LOCALE)
+    return chain
+
+
+def localized_asset(app_dir, pattern, lang_code):
+    """Return the first existing asset for pattern along lang_code's fallback chain.
+
+    pattern is relative to the app and has a {lang} placeholder, e.g.
+    'assets/app-store-badges/app-store-badge-{lang}.svg'.
+    """
+    index = asset_index(app_dir)
+    chain = fallback_chain(lang_code)
+    for code in chain:
+        path = pattern.format(lang=code)
+        if path in index:
+            return path
+    raise FileNotFoundError(f"no asset matches {pattern} in {app_dir} (tried {', '.join(chain)})")
+
+
+def locale_dirs():
+    """Directories of images/ that hold a locale's files: the shared languages and their fallbacks."""
+    return {code for lang in config.LANGUAGES for code in fallback_chain(lang['code'])}
+
+
+def shared_files(app_dir):
+    """Map localized images that duplicate another locale's bytes to the copy pages should use.
+
+    Only images/<locale>/ directories count (not images/iphone/). Files of
+    the same size are compared by content hash; the en copy is preferred,
+    otherwise the first path. Identical files within one locale keep their
+    own URLs.
+    """
+    app_dir = os.path.abspath(app_dir)
+    if app_dir not in _shared:
+        locales = locale_dirs()
+        by_size = {}
+        for path in asset_index(app_dir):
+            parts = path.split('/')
+            if len(parts) == 3 and parts[0] == 'images' and parts[1] in locales:
+                by_size.setdefault(os.path.getsize(os.path.join(app_dir, path)), []).append(path)
+        shared = {}
+        for paths in by_size.values():
+            if len(paths) < 2:
+                continue
+            by_hash = {}
+            for path in paths:
+                by_hash.setdefault(cached_file_hash(os.path.join(app_dir, path)), []).append(path)
+            for copies in by_hash.values():
+                copies.sort(key=lambda path: (path.split('/')[1] != DEFAULT_LOCALE, path))
+                shared.update((path, copies[0]) for path in copies[1:]
+                              if path.split('/')[1] != copies[0].split('/')[1])
+        _shared[app_dir] = shared
+    return _shared[app_dir]
+
+
+def localized_images(app_dir, lang_code):
+    """Return {name: path} for every file in images/en/, resolved for lang_code.
+
+    name is the file name without extension, e.g. {'title': 'images/ja/title.jpg'}.
+    """
+    prefix = f'images/{DEFAULT_LOCALE}/'
+    shared = shared_files(app_dir)
+    images = {}
+    for path in sorted(asset_index(app_dir)):
+        filename = path[len(prefix):]
+        if path.startswith(prefix) and '/' not in filename:
+            resolved = localized_asset(app_dir, 'images/{lang}/' + filename, lang_code)
+            images[os.path.splitext(filename)[0]] = shared.get(resolved, resolved)
+    return images
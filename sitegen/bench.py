@@ -0,0 +1,262 @@
+"""
+Build benchmarks
+
+Times each build phase against synthetic locale sets, so template and engine
+changes can't silently make builds slower:
+
+    python3 -m sitegen.bench                          # 14/200 languages x 10/1000 FAQ items
+    python3 -m sitegen.bench --languages 14 50 --faq 10 --apps WhereWasI
+
+Each app is copied to .build-cache/bench/<App> (images are symlinked), and
+its English locale is cloned into one locale per language with the FAQ list
+grown to the requested length. The shared LANGUAGES list is extended with
+synthetic languages; apps that define their own LANGUAGES keep them. Phases:
+
+    load_translation          load every locale
+    generate_features_html    render the feature cards of every locale (if the app has them)
+    generate_faq_html         render the FAQ of every locale (if the app has one)
+    generate_html             render every page
+    sitemap                   stream the sitemap
+    build                     build_site(force=True) with the default options, which
+                              write neither into images/ nor the header rules
+
+Every phase runs --repeat times and the fastest run counts. Results are
+appended to .build-cache/bench-history.json; a phase more than --threshold
+slower than the median of the previous runs (and by at least MIN_REGRESSION_MS)
+fails the run with exit status 1.
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+
+from . import config, engine
+from .files import load_json, save_json
+from .fragments import generate_hreflang_tags, generate_language_links, get_asset_path
+from .sitemap import sitemap_entries, write_sitemaps
+
+BENCH_DIR = os.path.join(config.ROOT_DIR, '.build-cache', 'bench')
+HISTORY_PATH = os.path.join(config.ROOT_DIR, '.build-cache', 'bench-history.json')
+
+LANGUAGE_COUNTS = [14, 200]
+FAQ_COUNTS = [10, 1000]
+
+# Runs the regression baseline is taken from, and the smallest slowdown that
+# counts as a regression (sub-millisecond phases are mostly noise)
+BASELINE_RUNS = 5
+MIN_REGRESSION_MS = 2.0
+
+# App files the benchmark copies; images are linked instead
+COPY_ITEMS = ('build.py', 'templates', 'css', 'js')
+LINK_ITEMS = ('images', 'assets')
+
+
+def synthetic_languages(count):
+    """The shared languages followed by synthetic ones, count in total."""
+    languages = list(config.LANGUAGES[:count])
+    for i in range(len(languages), count):
+        code = f'x-bench-{i:03d}'
+        languages.append({'code': code, 'name': f'Benchmark {i}', 'dir': code})
+    return languages
+
+
+def faq_list(translations):
+    """The FAQ list of a locale (apps call it 'items' or 'list')."""
+    faq = translations.get('faq', {})
+    return faq.get('items', faq.get('list'))
+
+
+def synthetic_locale(base, index, faq_count):
+    t = copy.deepcopy(base)
+    items = faq_list(t)
+    if items:
+        items[:] = [dict(items[i % len(items)], question=f"{items[i % len(items)]['question']} ({index}.{i})")
+                    for i in range(faq_count)]
+    return t
+
+
+def prepare_workspace(app_dir, languages, faq_count):
+    """Copy an app into the benchmark directory with synthetic locales."""
+    workspace = os.path.join(BENCH_DIR, os.path.basename(app_dir))
+    if os.path.exists(workspace):
+        shutil.rmtree(workspace)
+    os.makedirs(os.path.join(workspace, 'locales'))
+    for name in COPY_ITEMS:
+        source = os.path.join(app_dir, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(workspace, name))
+        elif os.path.exists(source):
+            shutil.copyfile(source, os.path.join(workspace, name))
+    for name in LINK_ITEMS:
+        if os.path.isdir(os.path.join(app_dir, name)):
+            os.symlink(os.path.join(app_dir, name), os.path.join(workspace, name))
+
+    base = load_json(os.path.join(app_dir, 'locales', 'en.json'))
+    if base is not None:
+        for i, lang in enumerate(languages):
+            with open(os.path.join(workspace, 'locales', f"{lang['code']}.json"), 'w', encoding='utf-8') as f:
+                json.dump(synthetic_locale(base, i, faq_count), f, ensure_ascii=False)
+    return workspace
+
+
+@contextlib.contextmanager
+def shared_languages(languages):
+    """Temporarily replace the shared language list (and the fragments cached from it)."""
+    saved = list(config.LANGUAGES), dict(config.LANGUAGE_NAMES)
+    config.LANGUAGES[:] = languages
+    config.LANGUAGE_NAMES.update({lang['code']: lang['name'] for lang in languages
+                                  if lang['code'] not in config.LANGUAGE_NAMES})
+    generate_hreflang_tags.cache_clear()
+    generate_language_links.cache_clear()
+    try:
+        yield
+    finally:
+        config.LANGUAGES[:] = saved[0]
+        config.LANGUAGE_NAMES.clear()
+        config.LANGUAGE_NAMES.update(saved[1])
+        generate_hreflang_tags.cache_clear()
+        generate_language_links.cache_clear()
+
+
+def best_time(func, repeat):
+    """Fastest of repeat runs of func, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def bench_app(workspace, repeat):
+    """Time every phase of one prepared app; returns {phase: ms}."""
+    app = engine.load_app(workspace)
+    languages = engine.app_languages(app)
+    locales = {lang['code']: engine.load_translation(app, lang['code']) for lang in languages}
+    results = {}
+
+    results['load_translation'] = best_time(
+        lambda: [engine.load_translation(app, lang['code']) for lang in languages], repeat)
+    if hasattr(app, 'generate_features_html'):
+        results['generate_features_html'] = best_time(
+            lambda: [app.generate_features_html(locales[lang['code']]['features']['list'],
+                                                get_asset_path(lang['dir'])) for lang in languages], repeat)
+    if hasattr(app, 'generate_faq_html'):
+        results['generate_faq_html'] = best_time(
+            lambda: [app.generate_faq_html(faq_list(locales[lang['code']])) for lang in languages], repeat)
+    results['generate_html'] = best_time(
+        lambda: [app.generate_html(lang, locales[lang['code']]) for lang in languages], repeat)
+
+    today = date.today().isoformat()
+    lastmods = {lang['code']: today for lang in languages}
+    results['sitemap'] = best_time(
+        lambda: write_sitemaps(workspace, app.BASE_URL, sitemap_entries(app.BASE_URL, languages, lastmods)), repeat)
+    # Without screenshot ingest (images/ links to the real app) or header rules (they cover the real apps)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results['build'] = best_time(lambda: engine.build_site(
+            [workspace], force=True, ingest_screenshots=False, header_rules=False, verbose=False), repeat)
+
+    engine.unload_app(workspace)
+    return results
+
+
+def run_benchmarks(app_names, language_counts, faq_counts, repeat):
+    """Return {'<app>/<languages>x<faq>/<phase>': ms} for every scenario."""
+    results = {}
+    for language_count in language_counts:
+        languages = synthetic_languages(language_count)
+        for faq_count in faq_counts:
+            with shared_languages(languages):
+                for name in app_names:
+                    workspace = prepare_workspace(os.path.join(config.ROOT_DIR, name), languages, faq_count)
+                    for phase, ms in bench_app(workspace, repeat).items():
+                        results[f'{name}/{language_count}x{faq_count}/{phase}'] = ms
+    shutil.rmtree(BENCH_DIR, ignore_errors=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=config.ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baselines(history, keys):
+    """Median of each key over the last BASELINE_RUNS runs that measured it."""
+    medians = {}
+    for key in keys:
+        values = [run['results'][key] for run in history if key in run['results']][-BASELINE_RUNS:]
+        if values:
+            medians[key] = statistics.median(values)
+    return medians
+
+
+def report(results, baseline, threshold):
+    """Print the results next to their baselines; returns the regressed keys."""
+    regressions = []
+    scenario = None
+    for key, ms in results.items():
+        name, current_scenario, phase = key.split('/')
+        if (name, current_scenario) != scenario:
+            scenario = (name, current_scenario)
+            language_count, faq_count = current_scenario.split('x')
+            print(f'\n{name}: {language_count} languages x {faq_count} FAQ items')
+        line = f'  {phase:<24} {ms:10.1f} ms'
+        if key in baseline:
+            change = (ms - baseline[key]) / baseline[key] * 100 if baseline[key] else 0.0
+            line += f'   baseline {baseline[key]:10.1f} ms  {change:+6.1f}%'
+            if ms > baseline[key] * (1 + threshold) and ms - baseline[key] >= MIN_REGRESSION_MS:
+                line += '  REGRESSION'
+                regressions.append(key)
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the site build against synthetic locales')
+    parser.add_argument('--apps', nargs='+', default=config.APPS, choices=config.APPS, metavar='APP',
+                        help=f"apps to benchmark (default: {' '.join(config.APPS)})")
+    parser.add_argument('--languages', nargs='+', type=int, default=LANGUAGE_COUNTS, metavar='N',
+                        help=f"language counts (default: {' '.join(map(str, LANGUAGE_COUNTS))})")
+    parser.add_argument('--faq', nargs='+', type=int, default=FAQ_COUNTS, metavar='N',
+                        help=f"FAQ list lengths (default: {' '.join(map(str, FAQ_COUNTS))})")
+    parser.add_argument('--repeat', type=int, default=3, metavar='N', help='runs per phase, fastest counts (default: 3)')
+    parser.add_argument('--threshold', type=float, default=0.25, metavar='FRACTION',
+                        help='slowdown against the baseline that fails the run (default: 0.25)')
+    parser.add_argument('--history', default=HISTORY_PATH, metavar='PATH',
+                        help='history file (default: .build-cache/bench-history.json)')
+    parser.add_argument('--no-record', action='store_true', help="compare only, don't append to the history")
+    args = parser.parse_args(argv)
+    if args.repeat < 1 or min(args.languages) < 1 or min(args.faq) < 0:
+        parser.error('--repeat and --languages must be at least 1, --faq at least 0')
+
+    print(f"Benchmarking {', '.join(args.apps)} (fastest of {args.repeat} runs)...")
+    start = time.perf_counter()
+    results = run_benchmarks(args.apps, args.languages, args.faq, args.repeat)
+    history = load_json(args.history, [])
+    regressions = report(results, baselines(history, results), args.threshold)
+
+    if not args.no_record:
+        history.append({'date': datetime.now().isoformat(timespec='seconds'), 'commit': git_commit(),
+                        'python': sys.version.split()[0], 'results': results})
+        save_json(args.history, history)
+    print(f'\nBenchmark complete in {time.perf_counter() - start:.1f} s'
+          f"{'' if args.no_record else f' - recorded to {os.path.relpath(args.history)}'}.")
+    if regressions:
+        print(f'{len(regressions)} phases regressed by more than {args.threshold:.0%}: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Page-weight budgets with every optional stage
+
+The default build checks the budgets of the pages it writes; this check
+builds every app with all the optional stages enabled (critical CSS and
+placeholders inline the most into a page), so a budget that only the opt-in
+stages break can't go unnoticed. The build runs in a temporary copy of the
+repository, leaving the working tree, its headers and routing rules as they
+are, and fails like the build when a page is over budget.
+
+    python3 -m sitegen.budgetcheck            # needs Pillow, like the stages
+    python3 -m sitegen.budgetcheck -j 4
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from .config import ROOT_DIR
+
+# Every optional stage of the build (see engine.main)
+ALL_STAGES = ['--ingest-screenshots', '--responsive-images', '--lqip', '--sprite', '--defer-analytics',
+              '--resource-hints', '--critical-css', '--minify', '--fingerprint', '--service-worker', '--compress']
+
+IGNORE = shutil.ignore_patterns('.git', '.build-cache', '__pycache__')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the page-weight budgets of a build with every optional stage')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='render pages in N worker processes (default: 1)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = os.path.join(tmp, 'site')
+        shutil.copytree(ROOT_DIR, workspace, symlinks=True, ignore=IGNORE)
+        print(f"Budgets: building every app with {' '.join(ALL_STAGES)}...")
+        result = subprocess.run([sys.executable, 'build.py', '--force', '--jobs', str(args.jobs), *ALL_STAGES],
+                                cwd=workspace)
+    if result.returncode != 0:
+        sys.exit(result.returncode)
+    print('Budgets: every page is within budget with all optional stages')
+
+
+if __name__ == '__main__':
+    main()
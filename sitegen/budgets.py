@@ -0,0 +1,132 @@
+"""
+Page-weight budgets
+
+After every build each written page is measured from its markup and the files
+it references on disk, by the bytes a visitor downloads: HTML, CSS, JS, SVG
+and the other text types compress.py precompresses count at their gzip size
+(what any host sends), images and fonts at their file size:
+
+    html_bytes                  the page itself
+    blocking_css_bytes          <link rel="stylesheet"> in <head> (not media="print")
+    blocking_js_bytes           <script src> in <head> without async, defer or type="module"
+    above_the_fold_image_bytes  distinct <img> up to the end of the hero section
+                                (largest src/srcset candidate of each)
+    requests                    the page plus every distinct resource it references
+
+<noscript> content is ignored, as browsers with scripts enabled never load
+it. Remote resources count as requests but not bytes. A page over any limit
+in BUDGETS fails the build; apps can override limits with a BUDGETS dict in
+their build.py (None disables a limit).
+"""
+
+import gzip
+import os
+import re
+
+from .compress import COMPRESS_EXTENSIONS
+from .critical import above_the_fold
+from .files import local_path
+from .markup import NOSCRIPT_RE, attributes, srcset_urls
+
+TAG_RE = re.compile(r'<(link|script|img|source|iframe|video|audio|use)\b[^>]*>', re.IGNORECASE)
+
+# Limits per page, in bytes except for requests
+BUDGETS = {
+    'html_bytes': 24 * 1024,
+    'blocking_css_bytes': 16 * 1024,
+    'blocking_js_bytes': 16 * 1024,
+    'above_the_fold_image_bytes': 500 * 1024,
+    'requests': 40,
+}
+
+# <link> relations that make the browser fetch the href
+FETCHED_RELS = {'stylesheet', 'preload', 'modulepreload', 'icon', 'apple-touch-icon', 'manifest'}
+
+# Metric, label and whether it is measured in bytes, in report order
+METRICS = [
+    ('html_bytes', 'HTML', True),
+    ('blocking_css_bytes', 'Render-blocking CSS', True),
+    ('blocking_js_bytes', 'Render-blocking JS', True),
+    ('above_the_fold_image_bytes', 'Above-the-fold images', True),
+    ('requests', 'Requests', False),
+]
+
+
+def transfer_size(data):
+    """Size of a text response sent gzip-compressed."""
+    return len(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def file_size(url, page_dir):
+    """Transfer size of a local file a page references; 0 for remote or missing files."""
+    filepath = local_path(url, page_dir)
+    if not filepath:
+        return 0
+    if filepath.lower().endswith(COMPRESS_EXTENSIONS):
+        with open(filepath, 'rb') as f:
+            return transfer_size(f.read())
+    return os.path.getsize(filepath)
+
+
+def measure_page(filepath):
+    """Return {metric: value} for a written page."""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    html = NOSCRIPT_RE.sub('', data.decode('utf-8'))
+    page_dir = os.path.dirname(filepath)
+    head_end = html.find('</head>')
+    fold_start = max(html.find('<body'), 0)
+    fold_end = fold_start + len(above_the_fold(html))
+
+    usage = {metric: 0 for metric, _, _ in METRICS}
+    usage['html_bytes'] = transfer_size(data)
+    requests = set()
+    fold_images = {}
+    for match in TAG_RE.finditer(html):
+        name = match.group(1).lower()
+        attrs = attributes(match.group(0))
+        in_head = match.start() < head_end
+        if name == 'link':
+            rels = set((attrs.get('rel') or '').lower().split())
+            if attrs.get('href') and rels & FETCHED_RELS:
+                requests.add(attrs['href'])
+                if 'stylesheet' in rels and in_head and attrs.get('media') != 'print':
+                    usage['blocking_css_bytes'] += file_size(attrs['href'], page_dir)
+        elif name == 'script':
+            if attrs.get('src'):
+                requests.add(attrs['src'])
+                if in_head and 'async' not in attrs and 'defer' not in attrs and attrs.get('type') != 'module':
+                    usage['blocking_js_bytes'] += file_size(attrs['src'], page_dir)
+        elif name == 'img':
+            candidates = ([attrs['src']] if attrs.get('src') else []) + srcset_urls(attrs.get('srcset') or '')
+            if candidates:
+                requests.add(candidates[0])
+            if candidates and fold_start <= match.start() < fold_end:
+                fold_images[candidates[0]] = max(file_size(url, page_dir) for url in candidates)
+        elif name == 'use':
+            # <use href="sprite.svg#icon"> fetches the sprite once; #icon alone is in-page
+            href = (attrs.get('href') or '').split('#')[0]
+            if href:
+                requests.add(href)
+        else:
+            # <source> inside <picture> is an alternative to its <img>; media sources are fetched
+            for attr in ('src', 'poster'):
+                if attrs.get(attr):
+                    requests.add(attrs[attr])
+    usage['above_the_fold_image_bytes'] = sum(fold_images.values())
+    usage['requests'] = 1 + len({url for url in requests if not url.startswith('data:')})
+    return usage
+
+
+def check_page(filepath, budgets=None):
+    """Return (usage, over) where over lists (metric, value, limit) beyond budget."""
+    budgets = {**BUDGETS, **(budgets or {})}
+    usage = measure_page(filepath)
+    over = [(metric, usage[metric], budgets[metric]) for metric, _, _ in METRICS
+            if budgets.get(metric) is not None and usage[metric] > budgets[metric]]
+    return usage, over
+
+
+def format_value(metric, value):
+    is_bytes = next(in_bytes for name, _, in_bytes in METRICS if name == metric)
+    return f'{value / 1024:.1f} KB' if is_bytes else str(value)
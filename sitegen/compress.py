@@ -0,0 +1,134 @@
+"""
+Precompressed output
+
+Writes .gz and .br siblings at maximum compression next to every HTML, CSS,
+JS, JSON, SVG and XML file an app serves, so the host can send them as-is
+instead of compressing on every request (nginx gzip_static/brotli_static, or
+any CDN that honours precompressed files).
+
+gzip output is deterministic (no timestamp or file name) and uses zopfli when
+it is installed; .br files need the brotli package and are skipped without
+it. Source hashes are cached in .build-cache/compressed.json, so unchanged
+files are not recompressed, and siblings of deleted files are removed.
+"""
+
+import gzip
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import ROOT_DIR
+from .files import load_json, save_json, write_if_changed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zopfli.gzip
+except ImportError:
+    zopfli = None
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.build-cache', 'compressed.json')
+
+COMPRESS_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.xml')
+
+# Build inputs that live inside app directories but are never served
+SKIP_DIRS = {'.build-cache', '__pycache__', 'templates', 'locales', 'docs'}
+
+
+def available_encodings():
+    return ['gz', 'br'] if brotli else ['gz']
+
+
+def find_files(app_dir):
+    """Return every compressible file an app serves, sorted."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(app_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in filenames:
+            if filename.endswith(COMPRESS_EXTENSIONS):
+                found.append(os.path.join(dirpath, filename))
+    return sorted(found)
+
+
+def gzip_bytes(data):
+    """Deterministic maximum-compression gzip (zopfli when installed)."""
+    if zopfli:
+        return zopfli.gzip.compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_file(filepath, encodings):
+    """Write the compressed siblings of one file (runs in worker processes).
+
+    Returns {encoding: compressed size}.
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    sizes = {}
+    if 'gz' in encodings:
+        compressed = gzip_bytes(data)
+        write_if_changed(filepath + '.gz', compressed)
+        sizes['gz'] = len(compressed)
+    if 'br' in encodings:
+        compressed = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+        write_if_changed(filepath + '.br', compressed)
+        sizes['br'] = len(compressed)
+    return sizes
+
+
+def remove_siblings(filepath):
+    for encoding in ('gz', 'br'):
+        if os.path.exists(f'{filepath}.{encoding}'):
+            os.remove(f'{filepath}.{encoding}')
+
+
+def compress_apps(app_dirs, jobs=1):
+    """Precompress every app's output; returns per-run statistics.
+
+    The result holds the number of files, how many were (re)compressed, and
+    the total original and compressed sizes per encoding.
+    """
+    index = load_json(CACHE_PATH, {})
+    encodings = available_encodings()
+    files = [filepath for app_dir in app_dirs for filepath in find_files(app_dir)]
+
+    stale = []
+    hashes = {}
+    for filepath in files:
+        rel = os.path.relpath(filepath, ROOT_DIR)
+        with open(filepath, 'rb') as f:
+            hashes[rel] = hashlib.sha256(f.read()).hexdigest()
+        entry = index.get(rel)
+        if (entry and entry['hash'] == hashes[rel] and sorted(entry['sizes']) == sorted(encodings)
+                and all(os.path.exists(f'{filepath}.{encoding}') for encoding in encodings)):
+            continue
+        stale.append(filepath)
+
+    if jobs > 1 and len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(compress_file, stale, [encodings] * len(stale)))
+    else:
+        results = [compress_file(filepath, encodings) for filepath in stale]
+    for filepath, sizes in zip(stale, results):
+        rel = os.path.relpath(filepath, ROOT_DIR)
+        index[rel] = {'hash': hashes[rel], 'size': os.path.getsize(filepath), 'sizes': sizes}
+
+    # Drop siblings of files that no longer exist in the apps being built
+    app_prefixes = tuple(os.path.relpath(app_dir, ROOT_DIR) + os.sep for app_dir in app_dirs)
+    for rel in sorted(index):
+        if rel.startswith(app_prefixes) and rel not in hashes:
+            remove_siblings(os.path.join(ROOT_DIR, rel))
+            del index[rel]
+    save_json(CACHE_PATH, index)
+
+    stats = {'files': len(files), 'compressed': len(stale), 'original': 0,
+             'sizes': {encoding: 0 for encoding in encodings}}
+    for filepath in files:
+        entry = index[os.path.relpath(filepath, ROOT_DIR)]
+        stats['original'] += entry['size']
+        for encoding in encodings:
+            stats['sizes'][encoding] += entry['sizes'][encoding]
+    return stats
@@ -0,0 +1,73 @@
+"""
+Shared configuration for every generated app site
+"""
+
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SITE_URL = 'https://masawata.net'
+
+# App directories built by the site generator (each has its own build.py)
+APPS = ['FitnessStory', 'WhereWasI', 'IceTimeTrack']
+
+# Hand-written pages at the site root that load gtag.js (--defer-analytics rewrites them too)
+ROOT_PAGES = ['index.html', 'privacy-policy.html']
+
+# Supported languages
+LANGUAGES = [
+    {'code': 'en', 'name': 'English', 'dir': ''},
+    {'code': 'zh-Hans', 'name': 'Chinese Simplified', 'dir': 'zh-Hans'},
+    {'code': 'zh-Hant', 'name': 'Chinese Traditional', 'dir': 'zh-Hant'},
+    {'code': 'ja', 'name': 'Japanese', 'dir': 'ja'},
+    {'code': 'ko', 'name': 'Korean', 'dir': 'ko'},
+    {'code': 'fr', 'name': 'French', 'dir': 'fr'},
+    {'code': 'de', 'name': 'German', 'dir': 'de'},
+    {'code': 'es', 'name': 'Spanish', 'dir': 'es'},
+    {'code': 'pt', 'name': 'Portuguese', 'dir': 'pt'},
+    {'code': 'it', 'name': 'Italian', 'dir': 'it'},
+    {'code': 'ru', 'name': 'Russian', 'dir': 'ru'},
+    {'code': 'hi', 'name': 'Hindi', 'dir': 'hi'},
+    {'code': 'id', 'name': 'Indonesian', 'dir': 'id'},
+    {'code': 'vi', 'name': 'Vietnamese', 'dir': 'vi'},
+]
+
+# Native language names shown in the language selector
+LANGUAGE_NAMES = {
+    'en': 'English', 'zh-Hans': '简体中文', 'zh-Hant': '繁體中文',
+    'ja': '日本語', 'ko': '한국어', 'fr': 'Français',
+    'de': 'Deutsch', 'es': 'Español', 'pt': 'Português',
+    'it': 'Italiano', 'ru': 'Русский', 'hi': 'हिन्दी',
+    'id': 'Indonesia', 'vi': 'Tiếng Việt'
+}
+
+OG_LOCALES = {
+    'en': 'en_US',
+    'zh-Hans': 'zh_CN',
+    'zh-Hant': 'zh_TW',
+    'ja': 'ja_JP',
+    'ko': 'ko_KR',
+    'fr': 'fr_FR',
+    'de': 'de_DE',
+    'es': 'es_ES',
+    'pt': 'pt_BR',
+    'it': 'it_IT',
+    'ru': 'ru_RU',
+    'hi': 'hi_IN',
+    'id': 'id_ID',
+    'vi': 'vi_VN',
+}
+
+# Google Analytics tracking code
+GOOGLE_ANALYTICS = '''<!-- Google tag (gtag.js) -->
+    <script async src="https://www.googletagmanager.com/gtag/js?id=G-ZL852HY2Z4"></script>
+    <script>
+      window.dataLayer = window.dataLayer || [];
+      function gtag(){dataLayer.push(arguments);}
+      gtag('js', new Date());
+
+      // Only track on production
+      if (location.hostname !== 'localhost' && location.hostname !== '127.0.0.1') {
+        gtag('config', 'G-ZL852HY2Z4');
+      }
+    </script>'''
@@ -0,0 +1,220 @@
+"""
+Critical CSS inlining
+
+For each rendered page, the rules of its local stylesheets that can match the
+above-the-fold markup (everything up to the end of the hero section: promo
+banner, header and hero) are inlined in a <style> block, and the stylesheet
+itself is loaded asynchronously with rel="preload" (plus a <noscript>
+fallback), so first paint no longer waits for the full CSS.
+
+Matching is conservative: a selector is kept when every tag, class and id it
+names appears in the above-the-fold markup, ignoring combinators, attribute
+selectors and pseudo-classes. @media/@supports blocks are filtered
+recursively, @font-face is always kept and @keyframes are kept when a kept
+rule names them.
+"""
+
+import os
+import re
+
+from .files import local_path
+
+STYLESHEET_RE = re.compile(r'^([ \t]*)<link rel="stylesheet" href="([^"]+)">', re.MULTILINE)
+HERO_RE = re.compile(r'<section\b[^>]*\bclass="hero\b')
+TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"')
+ID_ATTR_RE = re.compile(r'\sid="([^"]*)"')
+
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+# Pseudo-classes with arguments, attribute selectors and pseudo-elements/classes
+SELECTOR_NOISE_RE = re.compile(r':{1,2}[\w-]+\([^)]*\)|\[[^\]]*\]|:{1,2}[\w-]+')
+COMPOUND_TAG_RE = re.compile(r'^([a-zA-Z][\w-]*)')
+SELECTOR_CLASS_RE = re.compile(r'\.([\w-]+)')
+SELECTOR_ID_RE = re.compile(r'#([\w-]+)')
+KEYFRAMES_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+SPACE_RE = re.compile(r'\s+')
+PUNCT_SPACE_RE = re.compile(r'\s*([{};])\s*')
+
+# Parsed stylesheets, keyed by path and source
+_parsed = {}
+
+# Critical subsets, keyed by path, source and markup tokens (locales of one
+# app share their markup, so this is usually computed once per stylesheet)
+_critical = {}
+
+
+def above_the_fold(html):
+    """Return the page markup from <body> through the end of the hero section."""
+    start = html.find('<body')
+    hero = HERO_RE.search(html, max(start, 0))
+    end = html.find('</section>', hero.start() if hero else max(start, 0))
+    return html[max(start, 0):end + len('</section>') if end != -1 else len(html)]
+
+
+def markup_tokens(markup):
+    """Collect the tag names, classes and ids used in a chunk of markup."""
+    tags = {'html', 'body', '*'} | {tag.lower() for tag in TAG_RE.findall(markup)}
+    classes = set()
+    for value in CLASS_ATTR_RE.findall(markup):
+        classes.update(value.split())
+    ids = set(ID_ATTR_RE.findall(markup))
+    return tags, classes, ids
+
+
+def split_top_level(text, separator=','):
+    """Split on separator outside parentheses."""
+    parts = []
+    depth = 0
+    current = []
+    for char in text:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def selector_matches(selector, tokens):
+    tags, classes, ids = tokens
+    selector = SELECTOR_NOISE_RE.sub('', selector)
+    for compound in re.split(r'[\s>+~]+', selector.strip()):
+        tag = COMPOUND_TAG_RE.match(compound)
+        if tag and tag.group(1).lower() not in tags:
+            return False
+    return (all(name in classes for name in SELECTOR_CLASS_RE.findall(selector))
+            and all(name in ids for name in SELECTOR_ID_RE.findall(selector)))
+
+
+def parse_css(css):
+    """Parse a stylesheet into a list of (prelude, body) blocks.
+
+    body is a nested block list for grouping at-rules (@media, @supports),
+    a declaration string for everything else, and None for statements such
+    as @import.
+    """
+    css = COMMENT_RE.sub('', css)
+    blocks = []
+    pos = 0
+    length = len(css)
+    while pos < length:
+        brace = css.find('{', pos)
+        semicolon = css.find(';', pos)
+        if brace == -1 and semicolon == -1:
+            break
+        if semicolon != -1 and (brace == -1 or semicolon < brace) and css[pos:semicolon].strip().startswith('@'):
+            blocks.append((css[pos:semicolon].strip(), None))
+            pos = semicolon + 1
+            continue
+        prelude = css[pos:brace].strip()
+        depth = 1
+        end = brace + 1
+        while end < length and depth:
+            if css[end] == '{':
+                depth += 1
+            elif css[end] == '}':
+                depth -= 1
+            end += 1
+        body = css[brace + 1:end - 1]
+        if prelude.startswith(('@media', '@supports', '@layer', '@container')):
+            blocks.append((prelude, parse_css(body)))
+        else:
+            blocks.append((prelude, body.strip()))
+        pos = end
+    return blocks
+
+
+def filter_blocks(blocks, tokens):
+    """Return the blocks that can apply to markup with the given tokens."""
+    kept = []
+    for prelude, body in blocks:
+        if body is None or prelude.startswith('@font-face'):
+            kept.append((prelude, body))
+        elif isinstance(body, list):
+            inner = filter_blocks(body, tokens)
+            if inner:
+                kept.append((prelude, inner))
+        elif prelude.startswith('@'):
+            continue
+        elif any(selector_matches(selector, tokens) for selector in split_top_level(prelude)):
+            kept.append((prelude, body))
+    return kept
+
+
+def keyframes_blocks(blocks, used):
+    return [(prelude, body) for prelude, body in blocks
+            if KEYFRAMES_RE.match(prelude) and KEYFRAMES_RE.match(prelude).group(1) in used]
+
+
+def serialize(blocks):
+    out = []
+    for prelude, body in blocks:
+        if body is None:
+            out.append(f'{prelude};')
+        elif isinstance(body, list):
+            out.append(f'{prelude}{{{serialize(body)}}}')
+        else:
+            out.append(f'{prelude}{{{body}}}')
+    return PUNCT_SPACE_RE.sub(r'\1', SPACE_RE.sub(' ', ''.join(out)))
+
+
+def rebase_urls(css, css_dir, page_dir):
+    """Rewrite relative url()s in a stylesheet so they resolve from the page."""
+    def replace(match):
+        url = match.group(2)
+        if '://' in url or url.startswith(('data:', '/', '#')):
+            return match.group(0)
+        rebased = os.path.relpath(os.path.join(css_dir, url), page_dir).replace(os.sep, '/')
+        return f'url({match.group(1)}{rebased}{match.group(1)})'
+    return URL_RE.sub(replace, css)
+
+
+def read_stylesheet(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def critical_css(filepath, tokens):
+    """Return the critical subset of a stylesheet for the given markup tokens."""
+    source = read_stylesheet(filepath)
+    key = (filepath, source, tuple(frozenset(group) for group in tokens))
+    if key not in _critical:
+        if (filepath, source) not in _parsed:
+            _parsed[(filepath, source)] = parse_css(source)
+        blocks = _parsed[(filepath, source)]
+        css = serialize(filter_blocks(blocks, tokens))
+        used = set(re.findall(r'[\w-]+', css))
+        _critical[key] = css + serialize(keyframes_blocks(blocks, used))
+    return _critical[key]
+
+
+def inline_critical_css(html, page_dir):
+    """Inline the critical CSS of each local stylesheet and defer the rest.
+
+    Returns (html, deps, inlined_bytes) where deps are the stylesheets the
+    page now depends on.
+    """
+    tokens = markup_tokens(above_the_fold(html))
+    deps = set()
+    inlined = 0
+
+    def replace(match):
+        nonlocal inlined
+        indent, href = match.groups()
+        filepath = local_path(href, page_dir, ('.css',))
+        if not filepath:
+            return match.group(0)
+        deps.add(filepath)
+        css = rebase_urls(critical_css(filepath, tokens), os.path.dirname(filepath), page_dir)
+        inlined += len(css.encode('utf-8'))
+        return (f'{indent}<style>{css}</style>\n'
+                f'{indent}<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+                f'{indent}<noscript><link rel="stylesheet" href="{href}"></noscript>')
+
+    return STYLESHEET_RE.sub(replace, html), deps, inlined
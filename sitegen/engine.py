@@ -0,0 +1,724 @@
+"""
+Site generation engine shared by every app directory
+
+Each app directory has a build.py describing its page:
+
+    BASE_URL                      production URL of the app (required)
+    generate_html(lang, t)        render one locale page (required), usually
+                                  from templates/*.html (see templates.py)
+    LANGUAGES                     locales to build (default: config.LANGUAGES)
+    SITEMAP                       write sitemap.xml (default: True)
+    load_translation(lang_code)   load a locale (default: locales/<code>.json)
+    SCREENSHOT_NAMES              web names for screenshot masters (see screenshots.py)
+
+The engine loads the shared config once, optionally ingests new screenshot
+masters, renders every stale page of every app (optionally in one process pool), runs
+the post-render stages (image dimensions and placeholders, responsive images,
+SVG sprites, deferred analytics, resource hints, critical CSS, minification,
+asset fingerprints, service worker) over them, writes changed pages and
+sitemaps, records a build manifest per app for incremental builds,
+optionally precompresses the output and regenerates the cache and Early
+Hints header rules of every app (see headers.py). The manifest stores, per page, the
+hash of its locale file, of every file it depends on and of its output.
+"""
+
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+
+from . import (analytics, assets, budgets, compress, config, critical, fingerprint, headers, hints, imageinfo, images,
+               minify, routing, screenshots, serviceworker, sprites, tracing)
+from .files import cached_file_hash, file_hash, file_signature, load_json, save_json, write_if_changed
+from .fragments import page_url
+from .sitemap import read_lastmods, sitemap_entries, write_sitemaps
+
+SITEGEN_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# App modules loaded in this process, keyed by app directory
+_apps = {}
+
+
+def load_app(app_dir):
+    """Import an app's build.py (once per process).
+
+    The module is named after the full path, so a copy of an app elsewhere
+    (the benchmark workspace) never replaces the app itself in sys.modules.
+    """
+    app_dir = os.path.abspath(app_dir)
+    if app_dir not in _apps:
+        path_hash = hashlib.sha256(app_dir.encode('utf-8')).hexdigest()[:8]
+        name = f'sitegen_app_{os.path.basename(app_dir)}_{path_hash}'
+        spec = importlib.util.spec_from_file_location(name, os.path.join(app_dir, 'build.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        _apps[app_dir] = module
+    return _apps[app_dir]
+
+
+def unload_app(app_dir):
+    """Forget an app's module so the next load_app() re-imports build.py."""
+    module = _apps.pop(os.path.abspath(app_dir), None)
+    if module is not None:
+        sys.modules.pop(module.__name__, None)
+
+
+def app_name(app):
+    return os.path.basename(app.SCRIPT_DIR)
+
+
+def app_languages(app):
+    return getattr(app, 'LANGUAGES', config.LANGUAGES)
+
+
+def locale_path(app, lang_code):
+    return os.path.join(app.SCRIPT_DIR, 'locales', f'{lang_code}.json')
+
+
+def output_path(app, lang):
+    return os.path.join(app.SCRIPT_DIR, lang['dir'], 'index.html')
+
+
+def manifest_path(app):
+    return os.path.join(app.SCRIPT_DIR, '.build-cache', 'manifest.json')
+
+
+def load_translation(app, lang_code):
+    """Load a locale for an app, or None if the app has no such locale."""
+    if hasattr(app, 'load_translation'):
+        return app.load_translation(lang_code)
+    filepath = locale_path(app, lang_code)
+    if not os.path.exists(filepath):
+        return None
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def engine_hash():
+    """Hash the engine source, which also holds the shared constants."""
+    h = hashlib.sha256()
+    for filepath in sorted(glob.glob(os.path.join(SITEGEN_DIR, '*.py'))):
+        h.update(file_hash(filepath).encode())
+    return h.hexdigest()
+
+
+def generator_hash(app, options=None):
+    """Hash the generator inputs shared by every page of an app: the engine,
+    the app's build.py, its templates, the assets it ships and the output options."""
+    h = hashlib.sha256(engine_hash().encode())
+    h.update(json.dumps(options or {}, sort_keys=True).encode())
+    h.update(file_hash(os.path.join(app.SCRIPT_DIR, 'build.py')).encode())
+    for filepath in sorted(glob.glob(os.path.join(app.SCRIPT_DIR, 'templates', '*.html'))):
+        h.update(filepath.encode())
+        h.update(file_hash(filepath).encode())
+    h.update(assets.index_hash(app.SCRIPT_DIR).encode())
+    return h.hexdigest()
+
+
+def render_page(app_dir, lang):
+    """Load translations and render one page. Returns (html, seconds).
+
+    html is None when the app has no locale file for lang. Runs in worker
+    processes too, which load the app module themselves.
+    """
+    start = time.perf_counter()
+    app = load_app(app_dir)
+    with tracing.span('load_translation', 'locale', app=app_name(app), lang=lang['code']):
+        translations = load_translation(app, lang['code'])
+    with tracing.span('generate_html', 'locale', app=app_name(app), lang=lang['code']):
+        html = None if translations is None else app.generate_html(lang, translations)
+    return html, time.perf_counter() - start
+
+
+def render_page_traced(app_dir, lang):
+    """render_page() in a worker process, also returning the spans it recorded."""
+    tracing.enable()
+    html, seconds = render_page(app_dir, lang)
+    return html, seconds, tracing.collect()
+
+
+def render_pages(tasks, jobs=1):
+    """Render (app_dir, lang) tasks, in a process pool when jobs > 1.
+
+    Results are returned in the order of tasks, so parallel builds write
+    exactly the same files as serial ones.
+    """
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            if not tracing.enabled():
+                return list(executor.map(render_page, *zip(*tasks)))
+            results = list(executor.map(render_page_traced, *zip(*tasks)))
+        for _, _, events in results:
+            tracing.add(events)
+        return [(html, seconds) for html, seconds, _ in results]
+    return [render_page(app_dir, lang) for app_dir, lang in tasks]
+
+
+def deps_current(entry):
+    """True if every file a page depended on last build is unchanged.
+
+    Files whose signature (mtime and size) still matches are not reopened.
+    """
+    for rel, dep in entry.get('deps', {}).items():
+        filepath = os.path.join(config.ROOT_DIR, rel)
+        if file_signature(filepath) != dep['signature'] and cached_file_hash(filepath) != dep['hash']:
+            return False
+    return True
+
+
+def dep_entry(filepath):
+    return {'hash': cached_file_hash(filepath), 'signature': file_signature(filepath)}
+
+
+def process_screenshots(app_dirs, jobs=1):
+    """Encode the web copies of new or changed screenshot masters."""
+    stage_start = time.perf_counter()
+    masters, stale = screenshots.ingest(
+        [(app_dir, getattr(load_app(app_dir), 'SCREENSHOT_NAMES', None)) for app_dir in app_dirs], jobs)
+    if not masters:
+        return
+    if stale and not screenshots.available():
+        print(f'Screenshots: skipped {stale} changed masters - Pillow is not installed\n')
+    elif stale:
+        print(f'Screenshots: {masters} masters, {stale} encoded in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+
+
+def process_dimensions(pages, placeholders=False, jobs=1):
+    """Add intrinsic width/height (and LQIP placeholders) to the rendered pages' <img> tags."""
+    sources = set()
+    for page in pages:
+        sources |= imageinfo.find_images(page['html'], os.path.dirname(page['path']))
+    stage_start = time.perf_counter()
+    index, read = imageinfo.load_info(sources, placeholders, jobs)
+    print(f'Image sizes: {len(sources)} referenced, {read} read '
+          f'in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+    for page in pages:
+        page['html'], deps = imageinfo.annotate_images(page['html'], os.path.dirname(page['path']), index, placeholders)
+        page['deps'] |= deps
+
+
+def process_images(pages, jobs=1):
+    """Generate responsive variants for the rendered pages and rewrite their <img> tags."""
+    if not images.available():
+        print('Images: skipped responsive variants - Pillow is not installed\n')
+        return
+    sources = set()
+    for page in pages:
+        sources |= images.find_images(page['html'], os.path.dirname(page['path']))
+    stage_start = time.perf_counter()
+    index, encoded = images.build_variants(sources, jobs)
+    print(f'Images: {len(sources)} referenced, {encoded} encoded '
+          f'in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+    for page in pages:
+        sizes_map = getattr(page['app'], 'IMAGE_SIZES', None)
+        page['html'], deps = images.rewrite_images(page['html'], os.path.dirname(page['path']), index, sizes_map)
+        page['deps'] |= deps
+
+
+def process_sprites(plans):
+    """Move the rendered pages' inline SVG icons into one sprite per app."""
+    stage_start = time.perf_counter()
+    icons = 0
+    for app, _, entries, pages in plans:
+        fresh = [page for page in pages if page['task'] is not None and page['html'] is not None]
+        if not fresh:
+            continue
+        sprite = sprites.sprite_path(app.SCRIPT_DIR)
+        symbols = sprites.read_sprite(sprite)
+        for page in fresh:
+            sprite_url = os.path.relpath(sprite, os.path.dirname(page['path'])).replace(os.sep, '/')
+            page['html'], page['icons'] = sprites.extract_icons(page['html'], sprite_url, symbols)
+        # Pages that are up to date still use the symbols in their manifest entries
+        used = set()
+        for page in pages:
+            used |= page['icons'] if 'icons' in page else set(entries.get(page['lang']['code'], {}).get('icons', []))
+        changed = sprites.write_sprite(sprite, {icon: symbols[icon] for icon in used if icon in symbols})
+        for page in fresh:
+            if page['icons']:
+                page['deps'].add(sprite)
+        icons += len(used)
+        print(f"Sprites: {os.path.relpath(sprite, config.ROOT_DIR)} {len(used)} icons"
+              f"{' (updated)' if changed else ''}")
+    print(f'Sprites: {icons} icons in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+
+
+def process_analytics(pages):
+    """Load gtag.js from a deferred loader instead of an async <script> in every rendered page."""
+    deferred = 0
+    for page in pages:
+        page['html'], found = analytics.defer_analytics(page['html'])
+        deferred += found
+    print(f'Analytics: deferred gtag.js in {deferred} of {len(pages)} pages\n')
+
+
+def defer_root_analytics():
+    """Run the hand-written pages at the site root through the same deferred loader."""
+    changed = []
+    for name in config.ROOT_PAGES:
+        filepath = os.path.join(config.ROOT_DIR, name)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            html, found = analytics.defer_analytics(f.read())
+        if found and write_if_changed(filepath, html):
+            changed.append(name)
+    if changed:
+        print(f"Analytics: deferred gtag.js in {', '.join(changed)}\n")
+
+
+def process_resource_hints(pages):
+    """Preload each rendered page's LCP image and prefetch its likely next locale."""
+    stage_start = time.perf_counter()
+    preloaded = 0
+    for page in pages:
+        page['html'], deps, lcp = hints.add_resource_hints(page['html'], os.path.dirname(page['path']))
+        page['deps'] |= deps
+        preloaded += lcp is not None
+    print(f'Resource hints: LCP image in {preloaded} of {len(pages)} pages '
+          f'in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+
+
+def process_critical_css(pages):
+    """Inline each rendered page's critical CSS and load its stylesheets asynchronously."""
+    stage_start = time.perf_counter()
+    inlined = 0
+    for page in pages:
+        page['html'], deps, size = critical.inline_critical_css(page['html'], os.path.dirname(page['path']))
+        page['deps'] |= deps
+        inlined += size
+    print(f'Critical CSS: inlined {inlined / len(pages) / 1024:.1f} KB per page on average '
+          f'in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+
+
+def process_minify(pages):
+    """Minify the rendered pages and the stylesheets and scripts they load."""
+    stage_start = time.perf_counter()
+    for page in pages:
+        before = len(page['html'].encode('utf-8'))
+        page['html'], deps, assets = minify.minify_page(page['html'], os.path.dirname(page['path']))
+        page['deps'] |= deps
+        page['minified'] = (before, len(page['html'].encode('utf-8')))
+        for filepath, sizes in sorted(assets.items()):
+            print(f'Minify: {os.path.relpath(filepath, config.ROOT_DIR)} {format_sizes(*sizes)}')
+    print(f'Minify: {len(pages)} pages in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+
+
+def format_sizes(before, after):
+    return f'{before / 1024:.1f} KB -> {after / 1024:.1f} KB (-{(1 - after / before) * 100:.1f}%)'
+
+
+def process_fingerprints(pages):
+    """Point the rendered pages' asset references at content-hashed copies."""
+    stage_start = time.perf_counter()
+    index = fingerprint.load_index()
+    assets = set()
+    for page in pages:
+        page['html'], deps = fingerprint.fingerprint_page(page['html'], os.path.dirname(page['path']), index)
+        page['deps'] |= deps
+        assets |= deps
+    fingerprint.save_index(index)
+    print(f'Fingerprints: {len(assets)} assets in {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+
+
+def process_sw_registration(pages):
+    """Register each app's service worker in its rendered pages (before minify, so the script is minified too)."""
+    for page in pages:
+        sw = serviceworker.sw_path(page['app'].SCRIPT_DIR)
+        page['html'] = serviceworker.add_registration(
+            page['html'], os.path.relpath(sw, os.path.dirname(page['path'])).replace(os.sep, '/'))
+
+
+def process_service_worker(plans):
+    """Regenerate each app's precache manifest from the assets its pages reference."""
+    stage_start = time.perf_counter()
+    for app, _, entries, pages in plans:
+        sw = serviceworker.sw_path(app.SCRIPT_DIR)
+        assets = {}
+        for page in pages:
+            page_dir = os.path.dirname(page['path'])
+            if page['task'] is not None and page['html'] is not None:
+                page['sw_assets'] = serviceworker.page_assets(page['html'], page_dir, app.SCRIPT_DIR)
+            elif page['task'] is not None:
+                continue
+            # Pages that are up to date still reference the assets in their manifest entries
+            if 'sw_assets' in page:
+                assets[page_dir] = page['sw_assets']
+            else:
+                recorded = entries.get(page['lang']['code'], {}).get('sw_assets', {})
+                assets[page_dir] = tuple({os.path.join(config.ROOT_DIR, rel) for rel in recorded.get(kind, [])}
+                                         for kind in ('eager', 'lazy'))
+        changed, hashes = serviceworker.write_service_worker(
+            app.SCRIPT_DIR, app_name(app),
+            {serviceworker.page_path(page_dir, app.SCRIPT_DIR): files for page_dir, files in assets.items()})
+        print(f"Service worker: {os.path.relpath(sw, config.ROOT_DIR)} {len(hashes)} assets"
+              f"{' (updated)' if changed else ''}")
+    print(f'Service worker: {(time.perf_counter() - stage_start) * 1000:.1f} ms\n')
+
+
+def check_budgets(plans):
+    """Measure every written page against its app's budgets and report.
+
+    Returns the relative paths of the pages over budget.
+    """
+    failures = []
+    largest = {}
+    checked = 0
+    for app, _, _, pages in plans:
+        for page in pages:
+            if not os.path.exists(page['path']):
+                continue
+            usage, over = budgets.check_page(page['path'], getattr(app, 'BUDGETS', None))
+            checked += 1
+            for metric, value in usage.items():
+                largest[metric] = max(largest.get(metric, 0), value)
+            if over:
+                failures.append(os.path.relpath(page['path'], config.ROOT_DIR))
+                print(f'  Over budget: {failures[-1]}')
+                for metric, value, limit in over:
+                    label = next(label for name, label, _ in budgets.METRICS if name == metric)
+                    print(f'    {label:<24} {budgets.format_value(metric, value):>10} '
+                          f'(budget {budgets.format_value(metric, limit)})')
+    if failures:
+        print(f'Budgets: {len(failures)} of {checked} pages over budget\n')
+    elif checked:
+        print(f"Budgets: {checked} pages within budget (largest: " + ', '.join(
+            f'{label} {budgets.format_value(metric, largest[metric])}' for metric, label, _ in budgets.METRICS)
+            + ')\n')
+    return failures
+
+
+def precompress(app_dirs, jobs=1):
+    """Write .gz/.br siblings for every app's text output and report the savings."""
+    stage_start = time.perf_counter()
+    stats = compress.compress_apps(app_dirs, jobs)
+    savings = ', '.join(
+        f"{name} {size / 1024:.1f} KB (-{(1 - size / stats['original']) * 100:.1f}%)"
+        for name, size in (('gzip', stats['sizes'].get('gz')), ('brotli', stats['sizes'].get('br')))
+        if size is not None and stats['original'])
+    print(f"Compression: {stats['files']} files ({stats['compressed']} compressed) "
+          f"{stats['original'] / 1024:.1f} KB -> {savings or 'nothing to compress'} "
+          f"in {(time.perf_counter() - stage_start) * 1000:.1f} ms")
+    if 'br' not in compress.available_encodings():
+        print('Compression: skipped .br files - brotli is not installed')
+    print()
+
+
+def plan_app(app, tasks, options, force=False, only=None):
+    """Check which pages of an app are stale, appending their render tasks.
+
+    Returns (app, generator hash, manifest entries, pages).
+    """
+    manifest = {} if force else load_json(manifest_path(app), {})
+    generator = generator_hash(app, options)
+    if manifest.get('generator') != generator:
+        manifest = {}
+    entries = manifest.get('pages', {})
+
+    pages = []
+    for lang in app_languages(app):
+        page = {'app': app, 'lang': lang, 'path': output_path(app, lang),
+                'locale': file_hash(locale_path(app, lang['code'])), 'deps': set()}
+
+        # Skip pages whose inputs and output are unchanged since the last build
+        entry = entries.get(lang['code'], {})
+        if entry and only is not None and (app.SCRIPT_DIR, lang['code']) not in only:
+            page['task'] = None
+        elif (entry.get('locale') == page['locale'] and deps_current(entry)
+                and entry.get('output') == file_hash(page['path'])):
+            page['task'] = None
+        else:
+            page['task'] = len(tasks)
+            tasks.append((app.SCRIPT_DIR, lang))
+        pages.append(page)
+    return app, generator, entries, pages
+
+
+def update_routing():
+    """Regenerate the Accept-Language routing rules, which cover every app."""
+    apps = [load_app(os.path.join(config.ROOT_DIR, name)) for name in config.APPS]
+    changed = routing.write_routing([(app.BASE_URL, app_languages(app)) for app in apps])
+    if changed:
+        print(f"Routing: Updated: {', '.join(os.path.relpath(path, config.ROOT_DIR) for path in changed)}\n")
+
+
+def header_sites():
+    """[(BASE_URL, app_dir, [(lang dir, page file)])] of every app, as headers.py takes them."""
+    apps = [load_app(os.path.join(config.ROOT_DIR, name)) for name in config.APPS]
+    return [(app.BASE_URL, app.SCRIPT_DIR, [(lang['dir'], output_path(app, lang)) for lang in app_languages(app)])
+            for app in apps]
+
+
+def update_headers():
+    """Regenerate the cache and Early Hints header rules from the written pages of every app."""
+    changed = headers.write_headers(header_sites())
+    if changed:
+        print(f"Headers: Updated: {', '.join(os.path.relpath(path, config.ROOT_DIR) for path in changed)}\n")
+
+
+def build_site(app_dirs, force=False, jobs=1, ingest_screenshots=False, responsive_images=False, lqip=False,
+               sprite=False, defer_analytics=False, resource_hints=False, critical_css=False,
+               minified=False, fingerprints=False, service_worker=False, precompressed=False, header_rules=False,
+               only=None, verbose=True):
+    """Build every stale page of the given apps.
+
+    only, a set of (app directory, lang code), limits the staleness checks to
+    those pages (watch mode already knows which inputs changed); verbose=False
+    leaves out the pages and sitemaps that are up to date. Returns the pages
+    over their page-weight budgets.
+    """
+    if verbose:
+        print('Building localized HTML files for SEO...\n')
+    build_start = time.perf_counter()
+    # Asset memos are keyed by path and would go stale across watch rebuilds
+    minify.reset()
+    fingerprint.reset()
+    assets.reset()
+    if lqip and not images.available():
+        print('Image sizes: skipped LQIP placeholders - Pillow is not installed\n')
+    options = {
+        'responsive_images': responsive_images and images.available(),
+        'lqip': lqip and images.available(),
+        'sprite': sprite,
+        'defer_analytics': defer_analytics,
+        'resource_hints': resource_hints,
+        'critical_css': critical_css,
+        'minify': minified,
+        'fingerprints': fingerprints,
+        'service_worker': service_worker,
+    }
+
+    if ingest_screenshots:
+        with tracing.span('screenshots'):
+            process_screenshots(app_dirs, jobs)
+
+    # Work out which pages need rendering across every app
+    plans = []
+    tasks = []
+    for app_dir in app_dirs:
+        with tracing.span('plan', app=os.path.basename(app_dir)):
+            plans.append(plan_app(load_app(app_dir), tasks, options, force, only))
+
+    with tracing.span('render', pages=len(tasks)):
+        rendered = render_pages(tasks, jobs)
+
+    # Post-render stages run over the freshly rendered pages of every app
+    fresh = []
+    for _, _, _, pages in plans:
+        for page in pages:
+            if page['task'] is not None:
+                page['html'], page['render_time'] = rendered[page['task']]
+                if page['html'] is not None:
+                    fresh.append(page)
+    if fresh:
+        with tracing.span('dimensions'):
+            process_dimensions(fresh, options['lqip'], jobs)
+    if responsive_images and fresh:
+        with tracing.span('responsive_images'):
+            process_images(fresh, jobs)
+    if sprite and fresh:
+        with tracing.span('sprites'):
+            process_sprites(plans)
+    if defer_analytics and fresh:
+        with tracing.span('analytics'):
+            process_analytics(fresh)
+    if defer_analytics:
+        with tracing.span('root_analytics'):
+            defer_root_analytics()
+    if resource_hints and fresh:
+        with tracing.span('resource_hints'):
+            process_resource_hints(fresh)
+    if critical_css and fresh:
+        with tracing.span('critical_css'):
+            process_critical_css(fresh)
+    if service_worker and fresh:
+        with tracing.span('sw_registration'):
+            process_sw_registration(fresh)
+    if minified and fresh:
+        with tracing.span('minify'):
+            process_minify(fresh)
+    if fingerprints and fresh:
+        with tracing.span('fingerprints'):
+            process_fingerprints(fresh)
+    if service_worker:
+        with tracing.span('service_worker'):
+            process_service_worker(plans)
+
+    page_count = 0
+    written_count = 0
+    today = date.today().isoformat()
+    for app, generator, entries, pages in plans:
+        print(f'{app_name(app)}')
+        app_written = 0
+
+        # lastmod only moves when a page's content changes; pages without a
+        # manifest entry keep the date from the sitemap already on disk
+        previous_lastmods = read_lastmods(app.SCRIPT_DIR)
+        lastmods = {}
+
+        for page in pages:
+            lang = page['lang']
+            entry = entries.get(lang['code'], {})
+            lastmods[lang['code']] = previous_lastmods.get(page_url(app.BASE_URL, lang), today)
+            dir_display = f"{lang['dir']}/" if lang['dir'] else ''
+            if page['task'] is None:
+                if verbose:
+                    print(f"  Up to date: {dir_display}index.html ({lang['name']})")
+                lastmods[lang['code']] = entry.get('lastmod', lastmods[lang['code']])
+                page_count += 1
+                continue
+
+            if page['html'] is None:
+                print(f"  Skipped: {dir_display}index.html ({lang['name']}) - locale file not found")
+                continue
+
+            # Write HTML file
+            write_start = time.perf_counter()
+            with tracing.span('write', 'locale', app=app_name(app), lang=lang['code']):
+                written = write_if_changed(page['path'], page['html'])
+            write_time = time.perf_counter() - write_start
+            timing = f"render {page['render_time'] * 1000:.1f} ms, write {write_time * 1000:.1f} ms"
+            if 'minified' in page:
+                timing += f", minified {format_sizes(*page['minified'])}"
+            output = file_hash(page['path'])
+            if written:
+                print(f"  Created: {dir_display}index.html ({lang['name']}) - {timing}")
+                lastmods[lang['code']] = today
+                app_written += 1
+            else:
+                print(f"  Unchanged: {dir_display}index.html ({lang['name']}) - {timing}")
+                if entry.get('output') == output:
+                    lastmods[lang['code']] = entry.get('lastmod', lastmods[lang['code']])
+            entries[lang['code']] = {
+                'locale': page['locale'],
+                'deps': {os.path.relpath(dep, config.ROOT_DIR): dep_entry(dep) for dep in sorted(page['deps'])},
+                'output': output,
+                'lastmod': lastmods[lang['code']],
+            }
+            if page.get('icons'):
+                entries[lang['code']]['icons'] = sorted(page['icons'])
+            if 'sw_assets' in page:
+                entries[lang['code']]['sw_assets'] = {
+                    kind: sorted(os.path.relpath(f, config.ROOT_DIR) for f in files)
+                    for kind, files in zip(('eager', 'lazy'), page['sw_assets'])}
+            page_count += 1
+
+        # Stream the sitemap (only needed when a page changed, as lastmod moves with it)
+        sitemap = getattr(app, 'SITEMAP', True)
+        if sitemap and (force or app_written or not os.path.exists(os.path.join(app.SCRIPT_DIR, 'sitemap.xml'))):
+            with tracing.span('sitemap', app=app_name(app)):
+                files, changed = write_sitemaps(app.SCRIPT_DIR, app.BASE_URL,
+                                                sitemap_entries(app.BASE_URL, app_languages(app), lastmods))
+            names = ', '.join(os.path.basename(path) for path in files)
+            print(f"  {'Updated' if changed else 'Unchanged'}: {names}")
+        elif sitemap and verbose:
+            print('  Up to date: sitemap.xml')
+
+        with tracing.span('manifest', app=app_name(app)):
+            save_json(manifest_path(app), {'generator': generator, 'pages': entries})
+        written_count += app_written
+        print()
+
+    with tracing.span('budgets'):
+        over_budget = check_budgets(plans)
+
+    if precompressed:
+        with tracing.span('compress'):
+            precompress(app_dirs, jobs)
+
+    if header_rules:
+        with tracing.span('headers'):
+            update_headers()
+
+    total_time = time.perf_counter() - build_start
+    if verbose:
+        print(f'Build complete! Generated {page_count} localized pages across {len(plans)} apps '
+              f'({written_count} written) in {total_time * 1000:.1f} ms.')
+    return over_budget
+
+
+def main(argv=None, app_names=None):
+    """Command line entry point; app_names restricts the build to those apps."""
+    parser = argparse.ArgumentParser(description='Generate localized HTML files for SEO')
+    if app_names is None:
+        parser.add_argument('apps', nargs='*', metavar='APP',
+                            help=f"apps to build (default: {' '.join(config.APPS)})")
+    parser.add_argument('--force', action='store_true', help='ignore the build manifests and re-render every page')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='render pages in N worker processes (default: 1)')
+    parser.add_argument('--ingest-screenshots', action='store_true',
+                        help='encode web JPEGs of new or changed screenshot masters in images/<lang>/raw/ (needs Pillow)')
+    parser.add_argument('--responsive-images', action='store_true',
+                        help='generate AVIF/WebP variants and emit <picture> srcset markup (needs Pillow)')
+    parser.add_argument('--lqip', action='store_true',
+                        help='inline a blurred placeholder behind every opaque <img> (needs Pillow)')
+    parser.add_argument('--sprite', action='store_true',
+                        help='move inline SVG icons into one cacheable sprite per app, referenced with <use href>')
+    parser.add_argument('--defer-analytics', action='store_true',
+                        help='load gtag.js on idle or first interaction instead of with the page (queued events are kept)')
+    parser.add_argument('--resource-hints', action='store_true',
+                        help="preload each page's LCP image and prefetch the visitor's likely next locale")
+    parser.add_argument('--critical-css', action='store_true',
+                        help='inline the above-the-fold CSS and load stylesheets asynchronously')
+    parser.add_argument('--minify', action='store_true',
+                        help='minify the pages and load minified copies of their CSS/JS')
+    parser.add_argument('--fingerprint', action='store_true',
+                        help='reference content-hashed copies of CSS/JS/images (for immutable caching)')
+    parser.add_argument('--service-worker', action='store_true',
+                        help='write a service worker per app that precaches the assets its pages reference')
+    parser.add_argument('--compress', action='store_true',
+                        help='write .gz/.br siblings of every HTML/CSS/JS/JSON/SVG/XML file (brotli needs the brotli package)')
+    parser.add_argument('--headers', action='store_true',
+                        help='regenerate _headers and deploy/nginx-headers*.conf from the pages of every app')
+    parser.add_argument('--watch', action='store_true',
+                        help='rebuild affected pages on every change and serve a live-reloading preview')
+    parser.add_argument('--port', type=int, default=8000, metavar='PORT',
+                        help='preview server port for --watch (default: 8000)')
+    parser.add_argument('--profile', action='store_true',
+                        help='time every phase and locale, print the hot spots and write a Chrome trace')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='write the --profile trace to PATH (default: .build-cache/trace.json)')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='with --profile, also write cProfile stats per phase to .build-cache/cprofile/')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    profiling = args.profile or args.trace or args.cprofile
+    if profiling and args.watch:
+        parser.error('--profile cannot be combined with --watch')
+
+    names = app_names or args.apps or config.APPS
+    for name in names:
+        if name not in config.APPS:
+            parser.error(f"unknown app '{name}' (choose from {', '.join(config.APPS)})")
+
+    app_dirs = [os.path.join(config.ROOT_DIR, name) for name in names]
+    options = {'force': args.force, 'jobs': args.jobs, 'ingest_screenshots': args.ingest_screenshots,
+               'responsive_images': args.responsive_images, 'lqip': args.lqip, 'sprite': args.sprite,
+               'defer_analytics': args.defer_analytics, 'resource_hints': args.resource_hints,
+               'critical_css': args.critical_css, 'minified': args.minify, 'fingerprints': args.fingerprint,
+               'service_worker': args.service_worker, 'precompressed': args.compress, 'header_rules': args.headers}
+    update_routing()
+    if args.watch:
+        from .watch import watch
+        watch(app_dirs, options, args.port)
+        return
+    if not profiling:
+        over_budget = build_site(app_dirs, **options)
+    else:
+        cache_dir = os.path.join(config.ROOT_DIR, '.build-cache')
+        tracing.enable(cprofile=args.cprofile)
+        with tracing.span('build', 'build'):
+            over_budget = build_site(app_dirs, **options)
+        # A bare --trace file name has no directory to create
+        tracing.report(os.path.abspath(args.trace or os.path.join(cache_dir, 'trace.json')),
+                       os.path.join(cache_dir, 'cprofile') if args.cprofile else None)
+    if over_budget:
+        print(f"\nBuild failed: {len(over_budget)} pages over their page-weight budgets "
+              f"(see sitegen/budgets.py): {', '.join(over_budget)}")
+        sys.exit(1)
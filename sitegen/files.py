@@ -0,0 +1,96 @@
+"""
+File helpers shared by the build stages
+"""
+
+import hashlib
+import json
+import os
+from urllib.parse import unquote
+
+# Hashes of files the build only reads, keyed by path and file signature
+_hashes = {}
+
+
+def file_hash(filepath):
+    """Return the sha256 of a file's bytes, or None if it does not exist."""
+    if not os.path.exists(filepath):
+        return None
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def file_signature(filepath):
+    """Return [mtime_ns, size] of a file, or None if it does not exist."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def cached_file_hash(filepath):
+    """file_hash, computed at most once per process for an unchanged file."""
+    key = (filepath, tuple(file_signature(filepath) or ()))
+    if key not in _hashes:
+        _hashes[key] = file_hash(filepath)
+    return _hashes[key]
+
+
+def local_path(url, base_dir, extensions=None):
+    """Resolve a relative URL in a page or stylesheet to a file on disk, or None.
+
+    Absolute, root-relative, data: and fragment URLs are never local files.
+    """
+    if '://' in url or url.startswith(('data:', '/', '#', 'mailto:', 'tel:')):
+        return None
+    filepath = os.path.normpath(os.path.join(base_dir, unquote(url.split('#')[0].split('?')[0])))
+    if extensions and not filepath.lower().endswith(extensions):
+        return None
+    return filepath if os.path.isfile(filepath) else None
+
+
+def load_json(filepath, default=None):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(filepath, data):
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def write_if_changed(filepath, content):
+    """Write content unless the file already holds identical bytes.
+
+    Leaving identical files alone keeps their mtimes stable so deploys don't
+    invalidate CDN copies of pages that did not change. Returns True if the
+    file was written.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if os.path.exists(filepath):
+        with open(filepath, 'rb') as f:
+            if f.read() == data:
+                return False
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def replace_if_changed(tmp_path, filepath):
+    """Move tmp_path over filepath unless filepath already holds identical bytes.
+
+    Used for files that are streamed to disk. Returns True if filepath changed.
+    """
+    if os.path.exists(filepath):
+        with open(tmp_path, 'rb') as new, open(filepath, 'rb') as old:
+            if new.read() == old.read():
+                os.remove(tmp_path)
+                return False
+    os.replace(tmp_path, filepath)
+    return True
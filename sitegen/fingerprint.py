@@ -0,0 +1,144 @@
+"""
+Content-hashed asset fingerprinting
+
+Every local CSS, JS, image and font referenced by a rendered page (src, href,
+srcset and url() references) is copied to a name carrying the first 8 hex
+digits of its content hash, e.g. css/style.css -> css/style.1a2b3c4d.css, and
+the page is rewritten to point at the copy. Query strings such as ?v=1.1 are
+dropped. Stylesheets have their own url() references fingerprinted before
+they are hashed, so a changed image also changes the name of the CSS that
+uses it. Fingerprinted copies never change, so they can be served with a
+one-year immutable Cache-Control.
+
+Copies live next to their originals, which are left in place. The index in
+.build-cache/fingerprints.json maps each asset to its signature, current copy
+and previous copies, so unchanged assets are not rehashed. Pages cached by a
+CDN or a service worker may still point at a replaced copy after a deploy, so
+the last KEEP_COPIES copies of each asset are kept and only older ones are
+removed.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+
+from .config import ROOT_DIR
+from .files import file_signature, load_json, local_path, save_json, write_if_changed
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.build-cache', 'fingerprints.json')
+
+ASSET_EXTENSIONS = ('.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico',
+                    '.woff', '.woff2')
+HASH_LENGTH = 8
+# Replaced copies of an asset kept for pages that are still cached elsewhere
+KEEP_COPIES = 3
+
+HASHED_RE = re.compile(r'\.[0-9a-f]{%d}\.\w+$' % HASH_LENGTH)
+ATTR_RE = re.compile(r'\b(src|href)="([^"]+)"')
+SRCSET_RE = re.compile(r'\bsrcset="([^"]+)"')
+URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+# Fingerprinted copies made in this process and the assets they reference
+# (for stylesheets), keyed by asset path
+_copies = {}
+
+
+def reset():
+    """Forget the copies of the previous build (their assets may have changed since)."""
+    _copies.clear()
+
+
+def hashed_path(filepath, digest):
+    root, ext = os.path.splitext(filepath)
+    return f'{root}.{digest[:HASH_LENGTH]}{ext}'
+
+
+def fingerprint(filepath, index):
+    """Return (copy, deps): the path of an asset's fingerprinted copy, written
+    if needed, and the assets its content references."""
+    if filepath in _copies:
+        return _copies[filepath]
+    rel = os.path.relpath(filepath, ROOT_DIR)
+    entry = index.get(rel)
+    signature = file_signature(filepath)
+    deps = set()
+
+    if filepath.endswith('.css'):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = rewrite_css(f.read(), os.path.dirname(filepath), index, deps).encode('utf-8')
+        copy = hashed_path(filepath, hashlib.sha256(data).hexdigest())
+        write_if_changed(copy, data)
+    elif entry and entry['signature'] == signature and os.path.exists(os.path.join(ROOT_DIR, entry['copy'])):
+        copy = os.path.join(ROOT_DIR, entry['copy'])
+    else:
+        with open(filepath, 'rb') as f:
+            copy = hashed_path(filepath, hashlib.sha256(f.read()).hexdigest())
+        if not os.path.exists(copy):
+            shutil.copyfile(filepath, copy)
+
+    # Keep the copies this asset had before it changed, up to KEEP_COPIES
+    copy_rel = os.path.relpath(copy, ROOT_DIR)
+    previous = list(entry.get('previous', [])) if entry else []
+    if entry and entry['copy'] != copy_rel:
+        previous.insert(0, entry['copy'])
+    previous = [path for path in dict.fromkeys(previous) if path != copy_rel]
+    for path in previous[KEEP_COPIES:]:
+        stale = os.path.join(ROOT_DIR, path)
+        if os.path.exists(stale):
+            os.remove(stale)
+    index[rel] = {'signature': signature, 'copy': copy_rel, 'previous': previous[:KEEP_COPIES]}
+    _copies[filepath] = (copy, deps)
+    return _copies[filepath]
+
+
+def rewrite_url(url, base_dir, index, deps):
+    """Return url pointing at the fingerprinted copy of a local asset."""
+    filepath = local_path(url, base_dir, ASSET_EXTENSIONS)
+    if not filepath or HASHED_RE.search(filepath):
+        return url
+    copy, nested = fingerprint(filepath, index)
+    deps.add(filepath)
+    deps.update(nested)
+    path, hash_mark, fragment = url.partition('#')
+    path = path.split('?')[0]
+    head, slash, name = path.rpartition('/')
+    stem, ext = os.path.splitext(name)
+    digest = os.path.splitext(os.path.splitext(copy)[0])[1]
+    return f'{head}{slash}{stem}{digest}{ext}{hash_mark}{fragment}'
+
+
+def rewrite_css(css, base_dir, index, deps):
+    def replace(match):
+        quote, url = match.groups()
+        return f'url({quote}{rewrite_url(url, base_dir, index, deps)}{quote})'
+    return URL_RE.sub(replace, css)
+
+
+def rewrite_srcset(srcset, base_dir, index, deps):
+    candidates = []
+    for candidate in srcset.split(','):
+        url, _, descriptor = candidate.strip().partition(' ')
+        rewritten = rewrite_url(url, base_dir, index, deps)
+        candidates.append(f'{rewritten} {descriptor}' if descriptor else rewritten)
+    return ', '.join(candidates)
+
+
+def fingerprint_page(html, page_dir, index):
+    """Point a page's local asset references at fingerprinted copies.
+
+    Returns (html, deps) where deps are the original assets the page uses.
+    """
+    deps = set()
+    html = ATTR_RE.sub(lambda m: f'{m.group(1)}="{rewrite_url(m.group(2), page_dir, index, deps)}"', html)
+    html = SRCSET_RE.sub(lambda m: f'srcset="{rewrite_srcset(m.group(1), page_dir, index, deps)}"', html)
+    html = rewrite_css(html, page_dir, index, deps)
+    return html, deps
+
+
+def load_index():
+    return load_json(CACHE_PATH, {})
+
+
+def save_index(index):
+    save_json(CACHE_PATH, index)
@@ -0,0 +1,41 @@
+"""
+HTML fragments shared by every app page
+
+Fragments that only depend on shared config are cached, so they are built once
+per build (per app or per locale) rather than once per page.
+"""
+
+from functools import lru_cache
+
+from .config import LANGUAGES, LANGUAGE_NAMES
+
+
+def get_asset_path(lang_dir):
+    return '../' if lang_dir else ''
+
+
+def page_url(base_url, lang):
+    return f"{base_url}/{lang['dir']}/" if lang['dir'] else f"{base_url}/"
+
+
+@lru_cache(maxsize=None)
+def generate_hreflang_tags(base_url):
+    """Generate the hreflang block for an app (identical on all of its pages)."""
+    tags = ''
+    for lang in LANGUAGES:
+        tags += f'    <link rel="alternate" hreflang="{lang["code"]}" href="{page_url(base_url, lang)}">\n'
+    tags += f'    <link rel="alternate" hreflang="x-default" href="{base_url}/">'
+    return tags
+
+
+@lru_cache(maxsize=None)
+def generate_language_links(lang_code):
+    """Generate the language selector links for a locale (identical across apps)."""
+    lang_dir = next(lang['dir'] for lang in LANGUAGES if lang['code'] == lang_code)
+    asset_path = get_asset_path(lang_dir)
+    lang_links = ''
+    for l in LANGUAGES:
+        active = ' active' if l['code'] == lang_code else ''
+        href = f"{asset_path}{l['dir']}/" if l['dir'] else f"{asset_path}"
+        lang_links += f'                    <a href="{href}" hreflang="{l["code"]}" class="language-option{active}">{LANGUAGE_NAMES[l["code"]]}</a>\n'
+    return lang_links
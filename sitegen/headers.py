@@ -0,0 +1,185 @@
+"""
+Cache and Early Hints headers
+
+Static hosts serve fingerprinted images, CSS and index.html with the same
+default caching. python3 build.py --headers writes header rules from what it
+knows about each output of every app, to be committed with the pages:
+
+    _headers                         Netlify / Cloudflare Pages header rules
+    deploy/nginx-headers-maps.conf   nginx maps (include in the http block)
+    deploy/nginx-headers.conf        nginx add_header lines (include in the server block)
+
+Fingerprinted copies (a content hash in the name, see fingerprint.py) never
+change and are cached for a year as immutable. CSS, JS, images and fonts
+without a hash can change under the same URL, so they are cached briefly and
+then revalidated; pages and sitemaps are revalidated on every use, and sw.js
+is never served from the HTTP cache so new service worker versions are
+picked up.
+
+Each page also gets a Link header preloading what it needs first: its
+stylesheets (the full CSS behind the inlined critical CSS with
+--critical-css) and its hero image, the LCP candidate chosen as in hints.py,
+plus any font it preloads. CDNs that support Early Hints (Cloudflare, Fastly)
+send these as a 103 response while the page is still being fetched.
+
+The rules only depend on the pages and files on disk, so regenerating them
+from unchanged output leaves the files untouched; python3 -m
+sitegen.headerscheck fails when the committed rules don't match the pages.
+"""
+
+import html as html_lib
+import os
+import re
+from urllib.parse import quote, urljoin, urlparse
+
+from .compress import SKIP_DIRS
+from .config import ROOT_DIR
+from .files import local_path, write_if_changed
+from .fingerprint import ASSET_EXTENSIONS, HASHED_RE
+from .hints import lcp_candidate
+from .markup import NOSCRIPT_RE, attributes
+
+HEADERS_PATH = os.path.join(ROOT_DIR, '_headers')
+NGINX_MAPS_PATH = os.path.join(ROOT_DIR, 'deploy', 'nginx-headers-maps.conf')
+NGINX_PATH = os.path.join(ROOT_DIR, 'deploy', 'nginx-headers.conf')
+
+HEADER = 'Generated by sitegen/headers.py from the build output - do not edit'
+
+CACHE_CONTROL = {
+    'immutable': 'public, max-age=31536000, immutable',
+    'asset': 'public, max-age=600, must-revalidate',
+    'page': 'public, max-age=0, must-revalidate',
+    'sitemap': 'public, max-age=3600, must-revalidate',
+    'service_worker': 'no-cache',
+}
+
+SITEMAP_RE = re.compile(r'sitemap(?:-\d+)?\.xml(?:\.gz)?$')
+HEAD_LINK_RE = re.compile(r'<link\b[^>]*>')
+# Preloaded destinations worth sending as Early Hints
+PRELOAD_TYPES = ('style', 'image', 'font')
+
+
+def url_path(filepath):
+    return '/' + quote(os.path.relpath(filepath, ROOT_DIR).replace(os.sep, '/'))
+
+
+def link_url(href, page_url):
+    """Absolute path of a page's href, escaped for a Link header."""
+    return quote(urljoin(page_url, html_lib.unescape(href)), safe="/?&=%:#~")
+
+
+def page_links(html, page_dir, page_url):
+    """Return the Link header values preloading a page's stylesheets, preloads and LCP image."""
+    head = NOSCRIPT_RE.sub('', html[:html.find('</head>')])
+    links = []
+    image = False
+    for tag in HEAD_LINK_RE.findall(head):
+        attrs = attributes(tag)
+        href = attrs.get('href')
+        rels = set((attrs.get('rel') or '').lower().split())
+        if not href or not local_path(href, page_dir):
+            continue
+        if 'stylesheet' in rels:
+            links.append(f'<{link_url(href, page_url)}>; rel=preload; as=style')
+        elif 'preload' in rels and attrs.get('as') in PRELOAD_TYPES:
+            link = f"<{link_url(href, page_url)}>; rel=preload; as={attrs['as']}"
+            if attrs.get('as') == 'font':
+                link += f"; type={attrs.get('type', 'font/woff2')}; crossorigin"
+            if attrs.get('fetchpriority'):
+                link += f"; fetchpriority={attrs['fetchpriority']}"
+            links.append(link)
+            image = image or attrs.get('as') == 'image'
+    if not image:
+        lcp, _ = lcp_candidate(html, page_dir)
+        if lcp:
+            src = attributes(lcp.group(0))['src']
+            links.append(f'<{link_url(src, page_url)}>; rel=preload; as=image; fetchpriority=high')
+    return list(dict.fromkeys(links))
+
+
+def app_outputs(app_dir):
+    """Return {url path: cache policy} for the app's assets, sitemaps and service worker."""
+    outputs = {}
+    for dirpath, dirnames, filenames in os.walk(app_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            filepath = os.path.join(dirpath, filename)
+            if SITEMAP_RE.fullmatch(filename) and dirpath == app_dir:
+                outputs[url_path(filepath)] = 'sitemap'
+            elif filename == 'sw.js' and dirpath == app_dir:
+                outputs[url_path(filepath)] = 'service_worker'
+            elif filename.lower().endswith(ASSET_EXTENSIONS):
+                outputs[url_path(filepath)] = 'immutable' if HASHED_RE.search(filename) else 'asset'
+    return outputs
+
+
+def site_headers(apps):
+    """Return [(url path, cache policy, Link values)] for apps given as [(BASE_URL, app_dir, pages)].
+
+    pages is [(lang dir, page file)]; pages that haven't been built are skipped.
+    """
+    rules = []
+    for base_url, app_dir, pages in apps:
+        base_path = urlparse(base_url).path.rstrip('/') + '/'
+        for lang_dir, filepath in pages:
+            if not os.path.exists(filepath):
+                continue
+            with open(filepath, 'r', encoding='utf-8') as f:
+                html = f.read()
+            page_url = base_path + (f'{lang_dir}/' if lang_dir else '')
+            links = page_links(html, os.path.dirname(filepath), page_url)
+            rules.append((page_url, 'page', links))
+            rules.append((page_url + 'index.html', 'page', links))
+        rules.extend((path, policy, []) for path, policy in app_outputs(app_dir).items())
+    return rules
+
+
+def headers_file(rules):
+    lines = [f'# {HEADER}', '']
+    for path, policy, links in rules:
+        lines.append(path)
+        lines.append(f'  Cache-Control: {CACHE_CONTROL[policy]}')
+        if links:
+            lines.append(f"  Link: {', '.join(links)}")
+    return '\n'.join(lines) + '\n'
+
+
+def nginx_maps(rules):
+    lines = [f'# {HEADER}', '# include in the http block; nginx-headers.conf uses these variables', '',
+             'map $uri $sitegen_cache_control {', '    default "";']
+    lines.extend(f'    {path} "{CACHE_CONTROL[policy]}";' for path, policy, _ in rules if policy == 'page')
+    lines.append(f'    "~{HASHED_RE.pattern}" "{CACHE_CONTROL["immutable"]}";')
+    # Regexes are tried in order, so this only matches names without a hash
+    extensions = '|'.join(re.escape(ext[1:]) for ext in ASSET_EXTENSIONS)
+    lines.append(f'    "~*\\.(?:{extensions})$" "{CACHE_CONTROL["asset"]}";')
+    lines.append(f'    "~/{SITEMAP_RE.pattern}" "{CACHE_CONTROL["sitemap"]}";')
+    lines.append(f'    "~/sw\\.js$" "{CACHE_CONTROL["service_worker"]}";')
+    lines.extend(['}', '', 'map $uri $sitegen_link {', '    default "";'])
+    lines.extend(f"    {path} '{', '.join(links)}';" for path, _, links in rules if links)
+    lines.extend(['}', ''])
+    return '\n'.join(lines)
+
+
+def nginx_headers():
+    return '\n'.join([
+        f'# {HEADER}',
+        '# include in the server block for masawata.net (needs nginx-headers-maps.conf); add_header',
+        '# is not inherited by locations with add_header lines of their own, so repeat it there',
+        '# (nginx-locale.conf does)',
+        '',
+        'add_header Cache-Control $sitegen_cache_control;',
+        'add_header Link $sitegen_link;',
+        '',
+    ])
+
+
+def header_files(apps):
+    """Return [(path, content)] of the header rules for [(BASE_URL, app_dir, pages)]."""
+    rules = site_headers(apps)
+    return [(HEADERS_PATH, headers_file(rules)), (NGINX_MAPS_PATH, nginx_maps(rules)),
+            (NGINX_PATH, nginx_headers())]
+
+
+def write_headers(apps):
+    """Write the header rules for [(BASE_URL, app_dir, pages)]; returns the changed paths."""
+    return [path for path, content in header_files(apps) if write_if_changed(path, content)]
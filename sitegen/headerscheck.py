@@ -0,0 +1,46 @@
+"""
+Committed header rules against the built pages
+
+_headers and deploy/nginx-headers*.conf are generated from the pages and
+files on disk (see headers.py) but only written with python3 build.py
+--headers, so a page change committed without them leaves the host sending
+stale preloads. This check regenerates the rules in memory and fails if any
+committed file differs; rebuild with the flags of the deployed pages plus
+--headers and commit the result to fix it.
+
+    python3 -m sitegen.headerscheck
+"""
+
+import os
+import sys
+
+from . import engine
+from .config import ROOT_DIR
+from .headers import header_files
+
+
+def check():
+    """Return the header files that don't match the pages on disk."""
+    stale = []
+    for path, content in header_files(engine.header_sites()):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                current = f.read()
+        except OSError:
+            current = None
+        if current != content:
+            stale.append(os.path.relpath(path, ROOT_DIR))
+    return stale
+
+
+def main():
+    stale = check()
+    if stale:
+        print(f"Headers: out of date with the pages: {', '.join(stale)} "
+              f"(run python3 build.py --headers and commit them)")
+        sys.exit(1)
+    print('Headers: the committed rules match the pages')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Resource hints: LCP preload and locale prefetching
+
+With --resource-hints every rendered page gets:
+
+    - a high-priority preload for its LCP candidate, the largest image above
+      the fold, and fetchpriority="high" on the <img> itself:
+
+          <link rel="preload" href="images/en/title.jpg" as="image" fetchpriority="high">
+
+      Each eager <img> up to the end of the hero section is sized from its
+      width/height attributes and the px width, height and max-width its
+      classes get in the page's stylesheets (media queries aside), so a
+      1024px icon shown at 120px doesn't beat a phone screenshot. Images
+      under MIN_LCP_SIZE on both sides are skipped, as the LCP is then
+      usually text. An <img> inside <picture> only gets fetchpriority: a
+      single preload can't pick the <source> the browser will use.
+
+    - speculation rules that prefetch the other locales of the language
+      selector when the visitor hovers or presses a link (moderate
+      eagerness), and a small script that prefetches the visitor's likely
+      next locale right away: the first of navigator.languages the app has a
+      page for, when it isn't the page's own locale. Browsers without
+      speculation rules get <link rel="prefetch">.
+"""
+
+import json
+import re
+
+from .critical import COMPOUND_TAG_RE, SELECTOR_CLASS_RE, above_the_fold, parse_css, split_top_level
+from .files import local_path
+from .markup import attributes, in_picture
+
+IMG_RE = re.compile(r'<img\b[^>]*>')
+STYLESHEET_RE = re.compile(r'<link rel="stylesheet" href="([^"]+)">')
+HEAD_STYLESHEET_RE = re.compile(r'^([ \t]*)<link rel="stylesheet"', re.MULTILINE)
+LANG_LINK_RE = re.compile(r'<a\b[^>]*\bclass="language-option\b[^"]*"[^>]*>')
+DECLARATION_RE = re.compile(r'(?:^|;)\s*(width|height|max-width)\s*:\s*([\d.]+)px\s*(?=;|$)')
+COMBINATOR_RE = re.compile(r'\s*[\s>+~]\s*')
+
+# Rendered width and height (CSS px) below which an image is not an LCP candidate
+MIN_LCP_SIZE = 200
+
+SPECULATION_RULES = {'prefetch': [{
+    'where': {'selector_matches': '.language-option[hreflang]:not(.active)'},
+    'eagerness': 'moderate',
+}]}
+
+LOCALE_PREFETCH = '''<script>
+  (function (pages, current) {
+    function supported(tag) {
+      var lower = tag.toLowerCase();
+      for (var code in pages) {
+        if (code.toLowerCase() === lower) return code;
+      }
+      var base = lower.split('-')[0];
+      if (base === 'zh') base = /^zh-(?:.*-)?(?:hant|tw|hk|mo)\\b/i.test(tag) ? 'zh-Hant' : 'zh-Hans';
+      return base in pages ? base : null;
+    }
+    var languages = navigator.languages || [navigator.language || ''];
+    for (var i = 0; i < languages.length; i++) {
+      var code = supported(languages[i]);
+      if (!code) continue;
+      if (code === current) return;
+      if (window.HTMLScriptElement && HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules')) {
+        var rules = document.createElement('script');
+        rules.type = 'speculationrules';
+        rules.textContent = JSON.stringify({prefetch: [{source: 'list', urls: [pages[code]]}]});
+        document.head.appendChild(rules);
+      } else {
+        var link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.href = pages[code];
+        document.head.appendChild(link);
+      }
+      return;
+    }
+  })(%(pages)s, %(current)s);
+</script>'''
+
+# px sizes by class, keyed by stylesheet path and source
+_boxes = {}
+
+
+def class_boxes(filepath):
+    """Return {classes: {property: px}} for the top-level rules of a stylesheet
+    whose selectors end in classes (later rules win)."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        source = f.read()
+    key = (filepath, source)
+    if key not in _boxes:
+        boxes = {}
+        for prelude, body in parse_css(source):
+            if not isinstance(body, str) or prelude.startswith('@'):
+                continue
+            sizes = dict(DECLARATION_RE.findall(body))
+            if not sizes:
+                continue
+            for selector in split_top_level(prelude):
+                if ':' in selector or '[' in selector:
+                    continue
+                compound = COMBINATOR_RE.split(selector.strip())[-1]
+                tag = COMPOUND_TAG_RE.match(compound)
+                classes = SELECTOR_CLASS_RE.findall(compound)
+                if classes and (not tag or tag.group(1).lower() == 'img'):
+                    boxes.setdefault(tuple(sorted(classes)), {}).update(
+                        (name, float(value)) for name, value in sizes.items())
+        _boxes[key] = boxes
+    return _boxes[key]
+
+
+def rendered_size(attrs, boxes):
+    """Estimate an image's rendered (width, height) from its intrinsic size and its classes' px sizes."""
+    width, height = float(attrs['width']), float(attrs['height'])
+    classes = set(attrs.get('class', '').split())
+    box = {}
+    for selector_classes, sizes in boxes:
+        if set(selector_classes) <= classes:
+            box.update(sizes)
+    if 'width' in box and 'height' in box:
+        return box['width'], box['height']
+    if 'width' in box:
+        return box['width'], box['width'] * height / width
+    if 'height' in box:
+        return box['height'] * width / height, box['height']
+    shown = min(width, box.get('max-width', width))
+    return shown, shown * height / width
+
+
+def lcp_candidate(html, page_dir):
+    """Return (match of the page's LCP <img>, stylesheets read) or (None, stylesheets read)."""
+    head = html[:html.find('</head>')]
+    stylesheets = [path for path in (local_path(href, page_dir, ('.css',)) for href in STYLESHEET_RE.findall(head))
+                   if path]
+    boxes = [item for path in stylesheets for item in class_boxes(path).items()]
+    fold_start = max(html.find('<body'), 0)
+    fold_end = fold_start + len(above_the_fold(html))
+    best, best_area = None, 0
+    for match in IMG_RE.finditer(html, fold_start, fold_end):
+        attrs = attributes(match.group(0))
+        if (attrs.get('loading') == 'lazy' or not attrs.get('width') or not attrs.get('height')
+                or not local_path(attrs.get('src', ''), page_dir)):
+            continue
+        width, height = rendered_size(attrs, boxes)
+        if width < MIN_LCP_SIZE and height < MIN_LCP_SIZE:
+            continue
+        if width * height > best_area:
+            best, best_area = match, width * height
+    return best, set(stylesheets)
+
+
+def language_pages(html):
+    """Return ({lang code: href}, current lang code) from the page's language selector."""
+    pages = {}
+    current = None
+    for tag in LANG_LINK_RE.findall(html):
+        attrs = attributes(tag)
+        if 'hreflang' in attrs and 'href' in attrs:
+            pages.setdefault(attrs['hreflang'], attrs['href'])
+            if 'active' in attrs['class'].split():
+                current = attrs['hreflang']
+    return pages, current
+
+
+def add_resource_hints(html, page_dir):
+    """Add the LCP preload and locale prefetching to a rendered page.
+
+    Returns (html, deps, LCP image src or None) where deps are the
+    stylesheets used to size the images.
+    """
+    head_end = html.find('</head>')
+    if head_end == -1:
+        return html, set(), None
+    lcp, deps = lcp_candidate(html, page_dir)
+    src = None
+    preload = ''
+    if lcp:
+        tag = lcp.group(0)
+        src = attributes(tag)['src']
+        if 'fetchpriority=' not in tag:
+            html = html[:lcp.start()] + '<img fetchpriority="high"' + tag[len('<img'):] + html[lcp.end():]
+        if not in_picture(html, lcp.start()):
+            preload = f'<link rel="preload" href="{src}" as="image" fetchpriority="high">'
+
+    pages, current = language_pages(html)
+    hints = []
+    if current and len(pages) > 1:
+        hints.append(f'<script type="speculationrules">{json.dumps(SPECULATION_RULES)}</script>')
+        hints.append(LOCALE_PREFETCH % {'pages': json.dumps(pages, ensure_ascii=False),
+                                        'current': json.dumps(current)})
+    stylesheet = HEAD_STYLESHEET_RE.search(html, 0, head_end)
+    indent = stylesheet.group(1) if stylesheet else ''
+    if hints:
+        block = ''.join(f'{indent}{line}\n' for hint in hints for line in hint.splitlines())
+        html = html[:head_end].rstrip(' \t') + block + html[head_end:]
+    if preload:
+        # Ahead of the stylesheets, so the image request starts before they are parsed
+        pos = stylesheet.start() if stylesheet else html.find('</head>')
+        html = html[:pos] + f'{indent}{preload}\n' + html[pos:]
+    return html, deps, src
@@ -0,0 +1,194 @@
+"""
+Intrinsic image dimensions and LQIP placeholders
+
+Every local image referenced by an <img> on a rendered page gets width and
+height attributes read from its file header, so browsers reserve its box
+before it loads. With placeholders enabled, opaque raster images also get a
+tiny blurred WebP copy inlined as their background (LQIP) until the real image
+paints over it.
+
+Image info is cached in .build-cache/image-info.json keyed by file
+signature (mtime and size), so repeat builds don't reopen unchanged images.
+Headers are parsed without dependencies; placeholders need Pillow.
+"""
+
+import base64
+import io
+import os
+import re
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import ROOT_DIR
+from .files import file_signature, load_json, save_json
+from .images import IMG_RE, SRC_RE, local_image_path
+
+try:
+    from PIL import Image, ImageFilter
+except ImportError:
+    Image = None
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.build-cache', 'image-info.json')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg')
+
+# Placeholder width in pixels and WebP quality; the browser scales and the
+# blur hides the artifacts
+LQIP_WIDTH = 16
+LQIP_QUALITY = 40
+
+SVG_TAG_RE = re.compile(rb'<svg\b[^>]*>')
+SVG_LENGTH_RE = re.compile(r'^\s*([\d.]+)\s*(?:px)?\s*$')
+
+
+def svg_attr(tag, name):
+    match = re.search(rb'\s' + name.encode() + rb'="([^"]*)"', tag)
+    return match and match.group(1).decode()
+
+
+def svg_size(data):
+    tag = SVG_TAG_RE.search(data)
+    if not tag:
+        return None
+    tag = tag.group(0)
+    width, height = svg_attr(tag, 'width'), svg_attr(tag, 'height')
+    if width and height and SVG_LENGTH_RE.match(width) and SVG_LENGTH_RE.match(height):
+        return (round(float(SVG_LENGTH_RE.match(width).group(1))),
+                round(float(SVG_LENGTH_RE.match(height).group(1))))
+    view_box = svg_attr(tag, 'viewBox')
+    if view_box and len(view_box.replace(',', ' ').split()) == 4:
+        _, _, width, height = view_box.replace(',', ' ').split()
+        return round(float(width)), round(float(height))
+    return None
+
+
+def jpeg_size(data):
+    pos = 2
+    while pos + 9 < len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        # SOFn frames carry the dimensions (C4, C8 and CC are not frames)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None
+
+
+def read_size(filepath):
+    """Return (width, height) from an image's header, or None if unknown."""
+    with open(filepath, 'rb') as f:
+        data = f.read() if filepath.lower().endswith('.svg') else f.read(65536)
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return struct.unpack('>II', data[16:24])
+    if data.startswith(b'\xff\xd8'):
+        return jpeg_size(data)
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', data[6:10])
+    if data.startswith(b'RIFF') and data[8:12] == b'WEBP':
+        chunk = data[12:16]
+        if chunk == b'VP8X':
+            return (int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1)
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L':
+            bits = int.from_bytes(data[21:25], 'little')
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        return None
+    return svg_size(data)
+
+
+def make_placeholder(filepath):
+    """Return a data: URI of a tiny blurred copy, or None for images with transparency."""
+    with Image.open(filepath) as im:
+        im.draft('RGB', (LQIP_WIDTH * 4, LQIP_WIDTH * 4))
+        if 'A' in im.getbands() and im.getchannel('A').getextrema()[0] < 255:
+            return None
+        im = im.convert('RGB')
+        height = max(1, round(im.size[1] * LQIP_WIDTH / im.size[0]))
+        small = im.resize((LQIP_WIDTH, height), Image.BOX).filter(ImageFilter.GaussianBlur(1))
+    buf = io.BytesIO()
+    small.save(buf, 'WEBP', quality=LQIP_QUALITY)
+    return 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def describe(filepath, placeholder):
+    """Read one image's info (runs in worker processes)."""
+    size = read_size(filepath)
+    info = {'signature': file_signature(filepath), 'size': list(size) if size else None}
+    if placeholder:
+        info['lqip'] = make_placeholder(filepath) if size and not filepath.lower().endswith('.svg') else None
+    return info
+
+
+def find_images(html, page_dir):
+    """Return the set of local images referenced by <img> tags."""
+    found = set()
+    for tag in IMG_RE.findall(html):
+        src = SRC_RE.search(tag)
+        filepath = src and local_image_path(src.group(1), page_dir, IMAGE_EXTENSIONS)
+        if filepath:
+            found.add(filepath)
+    return found
+
+
+def load_info(filepaths, placeholders=False, jobs=1):
+    """Return the image info index, refreshing entries whose file changed.
+
+    The index maps image paths (relative to the repo root) to their signature,
+    size and (when placeholders is set) LQIP data URI. Returns (index, count
+    of images read).
+    """
+    index = load_json(CACHE_PATH, {})
+    placeholders = placeholders and Image is not None
+    stale = []
+    for filepath in sorted(filepaths):
+        entry = index.get(os.path.relpath(filepath, ROOT_DIR))
+        if (entry and entry['signature'] == file_signature(filepath)
+                and (not placeholders or 'lqip' in entry)):
+            continue
+        stale.append(filepath)
+
+    if stale:
+        if jobs > 1 and len(stale) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(describe, stale, [placeholders] * len(stale)))
+        else:
+            results = [describe(filepath, placeholders) for filepath in stale]
+        for filepath, info in zip(stale, results):
+            index[os.path.relpath(filepath, ROOT_DIR)] = info
+        save_json(CACHE_PATH, index)
+    return index, len(stale)
+
+
+def annotate_images(html, page_dir, index, placeholders=False):
+    """Add width/height (and an LQIP background) to local <img> tags.
+
+    Tags that already set width or height are left alone. Returns (html, deps)
+    where deps are the images the page now depends on.
+    """
+    deps = set()
+
+    def replace(match):
+        tag = match.group(0)
+        if re.search(r'\s(?:width|height)=', tag):
+            return tag
+        src = SRC_RE.search(tag)
+        filepath = src and local_image_path(src.group(1), page_dir, IMAGE_EXTENSIONS)
+        entry = filepath and index.get(os.path.relpath(filepath, ROOT_DIR))
+        if not entry or not entry['size']:
+            return tag
+        deps.add(filepath)
+        attrs = f' width="{entry["size"][0]}" height="{entry["size"][1]}"'
+        if placeholders and entry.get('lqip') and ' style="' not in tag:
+            attrs += f' style="background:url({entry["lqip"]}) center/cover no-repeat"'
+        end = -2 if tag.endswith('/>') else -1
+        return tag[:end].rstrip() + attrs + tag[end:]
+
+    return IMG_RE.sub(replace, html), deps
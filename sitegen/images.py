@@ -0,0 +1,197 @@
+"""
+Responsive image variants
+
+Every local JPEG/PNG referenced by an <img> on a rendered page gets
+width-bucketed AVIF and WebP variants under images/_variants/, and the <img>
+is wrapped in a <picture> whose <source> elements carry srcset/sizes.
+Variants are cached by source hash in .build-cache/images.json, so unchanged
+images are never re-encoded.
+
+Requires Pillow (pip install Pillow); AVIF needs Pillow 11.2+ or
+pillow-avif-plugin and is skipped when unavailable.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import ROOT_DIR
+from .files import file_hash, load_json, local_path, save_json
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.build-cache', 'images.json')
+
+# Target widths in CSS-independent pixels; each image also keeps its own width
+WIDTHS = (160, 320, 480, 640, 960, 1280)
+
+# Encoder settings per output format, in <source> order (best first)
+FORMATS = {
+    'avif': {'mime': 'image/avif', 'quality': 55},
+    'webp': {'mime': 'image/webp', 'quality': 80},
+}
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Rendered width of images by their class (or their parent's class); apps can
+# extend this with IMAGE_SIZES in their build.py
+IMAGE_SIZES = {
+    'nav__logo-img': '40px',
+    'nav__logo-icon': '36px',
+    'footer__logo': '32px',
+    'hero__icon': '120px',
+    'download__icon': '100px',
+    'download__icon-img': '100px',
+    'device-screen': '(max-width: 480px) 180px, (max-width: 768px) 220px, 280px',
+    'feature-card__image': '(max-width: 768px) 90vw, 360px',
+    'screenshot-item': '(max-width: 480px) 160px, 220px',
+    'hero__image': '(max-width: 480px) 90vw, 340px',
+    'step__device-img': '240px',
+    'screenshot-img': '260px',
+}
+DEFAULT_SIZES = '100vw'
+
+IMG_RE = re.compile(r'<img\b[^>]*>')
+SRC_RE = re.compile(r'\ssrc="([^"]+)"')
+CLASS_RE = re.compile(r'\sclass="([^"]+)"')
+PARENT_CLASS_RE = re.compile(r'<\w+\b[^>]*\sclass="([^"]+)"[^>]*>\s*$')
+
+
+def available():
+    return Image is not None
+
+
+def available_formats():
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def local_image_path(src, page_dir, extensions=SOURCE_EXTENSIONS):
+    """Resolve an <img src> to an image file on disk, or None."""
+    return local_path(src, page_dir, extensions)
+
+
+def variants_base(filepath):
+    """Where an image's variants live: <app>/images/_variants/<path under images>.
+
+    Returns None for images outside an app's images/ directory.
+    """
+    rel = os.path.relpath(filepath, ROOT_DIR).split(os.sep)
+    if len(rel) < 3 or rel[1] != 'images' or rel[2] == '_variants':
+        return None
+    stem = os.path.splitext(os.path.join(*rel[2:]))[0]
+    return os.path.join(ROOT_DIR, rel[0], 'images', '_variants', stem)
+
+
+def find_images(html, page_dir):
+    """Return the set of local raster images referenced by <img> tags."""
+    images = set()
+    for tag in IMG_RE.findall(html):
+        src = SRC_RE.search(tag)
+        filepath = src and local_image_path(src.group(1), page_dir)
+        if filepath and variants_base(filepath):
+            images.add(filepath)
+    return images
+
+
+def variant_widths(width):
+    return [w for w in WIDTHS if w < width * 0.9] + [width]
+
+
+def encode_variants(filepath, formats):
+    """Encode every width/format variant of one image (runs in worker processes)."""
+    base = variants_base(filepath)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    variants = {}
+    with Image.open(filepath) as im:
+        im.load()
+        size = im.size
+        if im.mode not in ('RGB', 'RGBA'):
+            im = im.convert('RGBA' if 'A' in im.getbands() or 'transparency' in im.info else 'RGB')
+        for width in variant_widths(size[0]):
+            height = round(size[1] * width / size[0])
+            resized = im if width == size[0] else im.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                out = f'{base}-{width}w.{fmt}'
+                resized.save(out, fmt.upper(), quality=FORMATS[fmt]['quality'])
+                variants.setdefault(fmt, []).append([width, os.path.relpath(out, ROOT_DIR)])
+    return {'size': list(size), 'variants': variants}
+
+
+def build_variants(images, jobs=1):
+    """Make sure every image has up-to-date variants; returns the variant index.
+
+    The index maps image paths (relative to the repo root) to their source
+    hash, size and variants. Only images whose hash changed (or whose variant
+    files are missing) are encoded.
+    """
+    index = load_json(CACHE_PATH, {})
+    formats = available_formats()
+    stale = []
+    for filepath in sorted(images):
+        rel = os.path.relpath(filepath, ROOT_DIR)
+        entry = index.get(rel)
+        if (entry and entry['hash'] == file_hash(filepath) and sorted(entry['variants']) == sorted(formats)
+                and all(os.path.exists(os.path.join(ROOT_DIR, path))
+                        for variants in entry['variants'].values() for _, path in variants)):
+            continue
+        stale.append(filepath)
+
+    if stale:
+        if jobs > 1 and len(stale) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(encode_variants, stale, [formats] * len(stale)))
+        else:
+            results = [encode_variants(filepath, formats) for filepath in stale]
+        for filepath, result in zip(stale, results):
+            result['hash'] = file_hash(filepath)
+            index[os.path.relpath(filepath, ROOT_DIR)] = result
+        save_json(CACHE_PATH, index)
+    return index, len(stale)
+
+
+def image_sizes(html, pos, tag, sizes_map):
+    """Pick sizes for an <img> by its class, falling back to its parent's class."""
+    candidates = []
+    match = CLASS_RE.search(tag)
+    if match:
+        candidates += match.group(1).split()
+    match = PARENT_CLASS_RE.search(html[max(0, pos - 500):pos])
+    if match:
+        candidates += match.group(1).split()
+    for name in candidates:
+        if name in sizes_map:
+            return sizes_map[name]
+    return DEFAULT_SIZES
+
+
+def rewrite_images(html, page_dir, index, sizes_map=None):
+    """Wrap local <img> tags that have variants in <picture> with srcset sources.
+
+    Returns (html, deps) where deps are the source images the page now depends on.
+    """
+    sizes_map = {**IMAGE_SIZES, **(sizes_map or {})}
+    deps = set()
+
+    def replace(match):
+        tag = match.group(0)
+        src = SRC_RE.search(tag)
+        filepath = src and local_image_path(src.group(1), page_dir)
+        entry = filepath and index.get(os.path.relpath(filepath, ROOT_DIR))
+        if not entry:
+            return tag
+        deps.add(filepath)
+        sizes = image_sizes(html, match.start(), tag, sizes_map)
+        sources = ''
+        for fmt in FORMATS:
+            if fmt not in entry['variants']:
+                continue
+            srcset = ', '.join(
+                f"{os.path.relpath(os.path.join(ROOT_DIR, path), page_dir).replace(os.sep, '/').replace(' ', '%20')} {width}w"
+                for width, path in entry['variants'][fmt])
+            sources += f'<source type="{FORMATS[fmt]["mime"]}" srcset="{srcset}" sizes="{sizes}">'
+        return f'<picture>{sources}{tag}</picture>'
+
+    return IMG_RE.sub(replace, html), deps
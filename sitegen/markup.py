@@ -0,0 +1,22 @@
+"""
+HTML tag helpers shared by the build stages
+"""
+
+import re
+
+ATTR_RE = re.compile(r'([\w:-]+)(?:\s*=\s*"([^"]*)")?')
+NOSCRIPT_RE = re.compile(r'<noscript\b.*?</noscript>', re.DOTALL | re.IGNORECASE)
+
+
+def attributes(tag):
+    """Return {lowercased name: value} of a tag's attributes ('' for boolean attributes)."""
+    return {name.lower(): value for name, value in ATTR_RE.findall(tag[tag.find(' '):]) if name}
+
+
+def srcset_urls(srcset):
+    return [candidate.split()[0] for candidate in srcset.split(',') if candidate.strip()]
+
+
+def in_picture(html, pos):
+    """Whether pos is inside a <picture> element."""
+    return html.rfind('<picture', 0, pos) > html.rfind('</picture>', 0, pos)
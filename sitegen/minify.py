@@ -0,0 +1,236 @@
+"""
+HTML, CSS and JS minification
+
+A conservative, dependency-free minifier, so the output is the same on every
+machine:
+
+- HTML: comments are stripped (conditional comments kept), whitespace runs
+  collapse to one space, and whitespace next to block-level tags is dropped.
+  <pre> and <textarea> contents are left alone; inline <style> blocks are
+  minified as CSS and inline scripts as JS, except JSON-LD, which is
+  re-serialized compactly.
+- CSS: comments are stripped and whitespace around punctuation removed.
+- JS: comments, indentation and blank lines are stripped and runs of spaces
+  collapse to one. Line breaks are kept, so automatic semicolon insertion
+  behaves exactly as in the source.
+
+Local stylesheets and scripts referenced by a page are written as
+name.min.css / name.min.js next to the original and the page points at them.
+"""
+
+import json
+import os
+import re
+
+from .files import local_path, write_if_changed
+from .markup import attributes
+
+HTML_TOKEN_RE = re.compile(
+    r'(<!--.*?-->|<(pre|textarea|script|style)\b[^>]*>.*?</\2\s*>|<[^>]+>)', re.DOTALL | re.IGNORECASE)
+TAG_NAME_RE = re.compile(r'</?([a-zA-Z][\w-]*)')
+SPACE_RE = re.compile(r'\s+')
+QUOTED_OR_SPACE_RE = re.compile(r'("[^"]*"|\'[^\']*\')|\s+')
+RAW_BLOCK_RE = re.compile(r'(<(\w+)\b[^>]*>)(.*)(</\2\s*>)', re.DOTALL)
+
+# Elements whose surrounding whitespace is never rendered
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'title', 'meta', 'link', 'script', 'style', 'noscript', 'base',
+    'header', 'footer', 'main', 'nav', 'section', 'article', 'aside', 'div', 'p', 'ul', 'ol', 'li',
+    'dl', 'dt', 'dd', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'form', 'fieldset', 'table', 'thead',
+    'tbody', 'tfoot', 'tr', 'td', 'th', 'figure', 'figcaption', 'picture', 'source', 'br', 'hr',
+    'details', 'summary', 'blockquote', 'address', 'template', '!doctype',
+}
+
+CSS_TOKEN_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.DOTALL)
+CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+CSS_COLON_RE = re.compile(r':\s+')
+
+JS_TOKEN_RE = re.compile(
+    r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`)'  # strings and template literals
+    r'|(/\*.*?\*/)'                                                   # block comments
+    r'|(//[^\n]*)'                                                    # line comments
+    r'|(/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[a-z]*)',         # regex literals (checked below)
+    re.DOTALL)
+# A / after one of these starts a regex literal rather than a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw'}
+LITERAL_MARK_RE = re.compile(r'\0(\d+)\0')
+# type attributes of inline scripts that run as JS
+JS_TYPES = {'', 'text/javascript', 'application/javascript', 'module'}
+
+ASSET_REF_RE = re.compile(r'\b(href|src)="([^"?#]+?)(\.css|\.js)([?#][^"]*)?"')
+
+# Stylesheets and scripts minified in this process, keyed by path, with
+# their (before, after) sizes
+_assets = {}
+
+
+def reset():
+    """Forget the assets minified in the previous build (they may have changed since)."""
+    _assets.clear()
+
+
+def minify_css(css):
+    parts = []
+    pos = 0
+    for match in CSS_TOKEN_RE.finditer(css):
+        parts.append(compact_css(css[pos:match.start()]))
+        if match.group(1):
+            parts.append(match.group(1))
+        pos = match.end()
+    parts.append(compact_css(css[pos:]))
+    return ''.join(parts).strip().replace(';}', '}')
+
+
+def compact_css(css):
+    css = SPACE_RE.sub(' ', css)
+    css = CSS_PUNCT_RE.sub(r'\1', css)
+    return CSS_COLON_RE.sub(':', css)
+
+
+def js_regex_allowed(code):
+    """True if a / following code begins a regex literal rather than a division."""
+    code = code.rstrip()
+    if not code or code[-1] in REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[\w$]+$', code)
+    return bool(word) and word.group(0) in REGEX_KEYWORDS
+
+
+def minify_js(js):
+    # Set string, template and regex literals aside so only code is compacted
+    literals = []
+    out = []
+    pos = 0
+    while True:
+        match = JS_TOKEN_RE.search(js, pos)
+        if not match:
+            out.append(js[pos:])
+            break
+        string, block, _, regex = match.groups()
+        if regex and not js_regex_allowed(''.join(out[-2:]) + js[pos:match.start()]):
+            out.append(js[pos:match.start() + 1])
+            pos = match.start() + 1
+            continue
+        out.append(js[pos:match.start()])
+        if string or regex:
+            out.append(f'\0{len(literals)}\0')
+            literals.append(string or regex)
+        elif block:
+            # A comment spanning lines still ends the statement before it
+            out.append('\n' if '\n' in block else ' ')
+        pos = match.end()
+
+    lines = (re.sub(r'[ \t]+', ' ', line).strip() for line in ''.join(out).split('\n'))
+    code = '\n'.join(line for line in lines if line)
+    return LITERAL_MARK_RE.sub(lambda m: literals[int(m.group(1))], code)
+
+
+def minify_tag(tag):
+    """Collapse whitespace inside a tag, leaving quoted attribute values alone."""
+    tag = QUOTED_OR_SPACE_RE.sub(lambda m: m.group(1) or ' ', tag)
+    return tag.replace(' >', '>').replace(' />', '/>')
+
+
+def minify_raw_block(token, name):
+    if name == 'style':
+        match = RAW_BLOCK_RE.match(token)
+        return minify_tag(match.group(1)) + minify_css(match.group(3)) + match.group(4)
+    if name == 'script' and 'application/ld+json' in token[:token.find('>')]:
+        match = RAW_BLOCK_RE.match(token)
+        try:
+            data = json.loads(match.group(3))
+        except ValueError:
+            return token
+        compact = json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+        return minify_tag(match.group(1)) + compact + match.group(4)
+    if name == 'script':
+        match = RAW_BLOCK_RE.match(token)
+        attrs = attributes(match.group(1))
+        if 'src' not in attrs and (attrs.get('type') or '').lower() in JS_TYPES:
+            return minify_tag(match.group(1)) + minify_js(match.group(3)) + match.group(4)
+    return token
+
+
+def minify_html(html):
+    tokens = []
+    pos = 0
+    for match in HTML_TOKEN_RE.finditer(html):
+        tokens.append(('text', html[pos:match.start()]))
+        token = match.group(1)
+        if token.startswith('<!--'):
+            if token.startswith('<!--[if'):
+                tokens.append(('tag', token, None))
+        elif match.group(2):
+            tokens.append(('tag', minify_raw_block(token, match.group(2).lower()), match.group(2).lower()))
+        else:
+            name = TAG_NAME_RE.match(token)
+            tokens.append(('tag', minify_tag(token), name.group(1).lower() if name else token[1:9].lower()))
+        pos = match.end()
+    tokens.append(('text', html[pos:]))
+
+    # Name of the nearest tag before and after each token (None at the edges)
+    before = []
+    name = None
+    for token in tokens:
+        before.append(name)
+        if token[0] == 'tag':
+            name = token[2]
+    after = []
+    name = None
+    for token in reversed(tokens):
+        after.append(name)
+        if token[0] == 'tag':
+            name = token[2]
+    after.reverse()
+
+    out = []
+    for token, previous, following in zip(tokens, before, after):
+        if token[0] == 'tag':
+            out.append(token[1])
+            continue
+        text = SPACE_RE.sub(' ', token[1])
+        if previous is None or previous in BLOCK_TAGS:
+            text = text.lstrip()
+        if following is None or following in BLOCK_TAGS:
+            text = text.rstrip()
+        out.append(text)
+    return ''.join(out)
+
+
+def minified_path(filepath):
+    root, ext = os.path.splitext(filepath)
+    return f'{root}.min{ext}'
+
+
+def minify_asset(filepath):
+    """Write name.min.css/.js for a stylesheet or script; returns (before, after) sizes."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        source = f.read()
+    minified = minify_css(source) if filepath.endswith('.css') else minify_js(source)
+    write_if_changed(minified_path(filepath), minified + '\n')
+    return len(source.encode('utf-8')), len(minified.encode('utf-8')) + 1
+
+
+def minify_page(html, page_dir):
+    """Point a page at minified copies of its local CSS/JS and minify its HTML.
+
+    Returns (html, deps, assets) where deps are the original stylesheets and
+    scripts and assets maps the ones first minified by this call to their
+    (before, after) sizes.
+    """
+    deps = set()
+    assets = {}
+
+    def replace(match):
+        attr, stem, ext, suffix = match.groups()
+        filepath = local_path(stem + ext, page_dir, (ext,))
+        if not filepath or stem.endswith('.min'):
+            return match.group(0)
+        deps.add(filepath)
+        if filepath not in _assets:
+            _assets[filepath] = assets[filepath] = minify_asset(filepath)
+        return f'{attr}="{stem}.min{ext}{suffix or ""}"'
+
+    html = minify_html(ASSET_REF_RE.sub(replace, html))
+    return html, deps, assets
@@ -0,0 +1,154 @@
+"""
+Local test harness for the Accept-Language routing rules
+
+Regenerates the rules from every app's LANGUAGES and evaluates each output
+against TEST_CASES: the nginx maps are interpreted in Python, the _redirects
+rules are matched the way Netlify processes them (first match wins), and the
+edge function runs under node (skipped when node is not installed). Every
+result must agree with the expected locale and with routing.locale_for().
+
+    python3 -m sitegen.routecheck
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from . import config, engine
+from .config import ROOT_DIR
+from .routing import (EDGE_PATH, NGINX_MAPS_PATH, NGINX_PATH, REDIRECTS_PATH, first_language, locale_for,
+                      site_routes, variable_name, write_routing)
+
+# (Accept-Language, preferred_locale cookie, expected locale or None to stay)
+TEST_CASES = [
+    ('ja,en-US;q=0.9,en;q=0.8', None, 'ja'),
+    ('en-US,en;q=0.9', None, None),
+    ('en', None, None),
+    ('fr-CA,fr;q=0.9', None, 'fr'),
+    ('pt-BR', None, 'pt'),
+    ('de', None, 'de'),
+    ('ko-KR', None, 'ko'),
+    ('zh-TW,zh;q=0.9', None, 'zh-Hant'),
+    ('zh-HK', None, 'zh-Hant'),
+    ('zh-Hant-MO', None, 'zh-Hant'),
+    ('zh-CN,zh;q=0.9', None, 'zh-Hans'),
+    ('zh-Hans', None, 'zh-Hans'),
+    ('zh', None, 'zh-Hans'),
+    ('ZH-tw', None, 'zh-Hant'),
+    ('nl-NL,ja;q=0.5', None, None),
+    ('', None, None),
+    (None, None, None),
+    ('ja', 'en', None),
+    ('en-US', 'de', 'de'),
+    ('de', 'xx', 'de'),
+    ('hi-IN', None, 'hi'),
+    ('vi', None, 'vi'),
+]
+
+
+def nginx_locale(maps, locations, path, accept_language, cookie):
+    """Evaluate the generated nginx maps and location for a request the way nginx would."""
+    name = variable_name(path)
+    redirect = (rf'location = {re.escape(path)} {{[^}}]*if \(\${name}_locale\) {{\s*'
+                rf'return 302 {re.escape(path)}\${name}_locale/;')
+    if not re.search(redirect, locations):
+        return None
+    blocks = dict(re.findall(r'map \S+ \$(\w+) \{\n(.*?)\n\}', maps, re.DOTALL))
+    accept = ''
+    for line in blocks[f'{name}_accept_locale'].splitlines()[1:]:
+        pattern, directory = re.match(r'\s*"~\*(.*)" (\S+);', line).groups()
+        if re.search(pattern, accept_language or '', re.IGNORECASE):
+            accept = directory
+            break
+    result = accept
+    for line in blocks[f'{name}_locale'].splitlines()[1:]:
+        value, directory = line.strip().rstrip(';').split(' ', 1)
+        if value == cookie:
+            result = '' if directory == '""' else directory
+    return result or None
+
+
+def redirects_locale(redirects, path, accept_language, cookie):
+    """Evaluate the generated _redirects rules (first match wins)."""
+    tag = first_language(accept_language).lower()
+    for line in redirects.splitlines():
+        fields = line.split()
+        if len(fields) != 4 or fields[0] != path:
+            continue
+        condition, values = fields[3].split('=', 1)
+        if condition == 'Cookie' and cookie is not None:
+            return None
+        if condition == 'Language' and any(tag == value or tag.startswith(value + '-') for value in values.split(',')):
+            return fields[1][len(path):].rstrip('/')
+    return None
+
+
+def edge_results(routes, cases):
+    """Run the edge function under node; None when node is not installed."""
+    if not shutil.which('node'):
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        module = os.path.join(tmp, 'locale-router.mjs')
+        shutil.copyfile(EDGE_PATH, module)
+        requests = [[path, accept, cookie] for path, _ in routes for accept, cookie, _ in cases]
+        script = (f"import {{ localeFor }} from {json.dumps(module)};\n"
+                  f"console.log(JSON.stringify({json.dumps(requests)}.map(r => localeFor(...r))));")
+        result = subprocess.run(['node', '--input-type=module', '-e', script], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return iter(json.loads(result.stdout))
+
+
+def check(apps):
+    """Check every generated rule set against TEST_CASES; returns the failures."""
+    routes = site_routes(apps)
+    with open(NGINX_MAPS_PATH, 'r', encoding='utf-8') as f:
+        nginx_maps = f.read()
+    with open(NGINX_PATH, 'r', encoding='utf-8') as f:
+        nginx_locations = f.read()
+    with open(REDIRECTS_PATH, 'r', encoding='utf-8') as f:
+        redirects = f.read()
+    edge = edge_results(routes, TEST_CASES)
+
+    failures = []
+    checked = 0
+    for path, locales in routes:
+        for accept, cookie, expected in TEST_CASES:
+            expected = locales.get(expected) if expected else None
+            results = {
+                'reference': locale_for(accept, cookie, locales),
+                'nginx': nginx_locale(nginx_maps, nginx_locations, path, accept, cookie),
+                'edge': next(edge) if edge else expected,
+            }
+            # Netlify can't read the cookie value; a saved choice falls back to the page script
+            if cookie is None:
+                results['_redirects'] = redirects_locale(redirects, path, accept, cookie)
+            for target, result in results.items():
+                checked += 1
+                if result != expected:
+                    failures.append(f'{target}: {path} Accept-Language={accept!r} cookie={cookie!r} '
+                                    f'-> {result!r}, expected {expected!r}')
+    if edge is None:
+        print('Routing: skipped the edge function - node is not installed')
+    print(f'Routing: {checked - len(failures)} of {checked} checks passed')
+    for failure in failures:
+        print(f'  FAIL {failure}')
+    return failures
+
+
+def main():
+    apps = []
+    for name in config.APPS:
+        app = engine.load_app(os.path.join(ROOT_DIR, name))
+        apps.append((app.BASE_URL, engine.app_languages(app)))
+    write_routing(apps)
+    if check(apps):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
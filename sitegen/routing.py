@@ -0,0 +1,205 @@
+"""
+Accept-Language routing
+
+Generates server and edge routing rules that send a visitor of an app's
+default (English) page straight to their locale, instead of loading the
+English page and redirecting from js/main.js:
+
+    _redirects                      Netlify redirect rules (Language= conditions)
+    deploy/nginx-locale-maps.conf   nginx maps (include in the http block)
+    deploy/nginx-locale.conf        nginx locations (include in the server block)
+    deploy/locale-router.js         edge function (Netlify Edge / Cloudflare Workers style)
+
+The rules match what main.js does on hosts without routing (GitHub Pages):
+a saved choice (the preferred_locale cookie, mirrored from localStorage by
+main.js) wins, otherwise the first language of Accept-Language picks the
+locale by exact tag, then base language, with Chinese split into
+Traditional (Hant, TW, HK, MO) and Simplified. English and unsupported
+languages stay on the default page.
+
+python3 -m sitegen.routecheck tests the generated rules.
+"""
+
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+from .config import ROOT_DIR
+from .files import write_if_changed
+
+# nginx exposes cookies as $cookie_<name>, so the name avoids hyphens
+COOKIE_NAME = 'preferred_locale'
+DEFAULT_LOCALE = 'en'
+
+# Chinese scripts chosen by script or region subtag
+TRADITIONAL_CHINESE_RE = re.compile(r'^zh-(?:.*-)?(?:hant|tw|hk|mo)\b', re.IGNORECASE)
+
+REDIRECTS_PATH = os.path.join(ROOT_DIR, '_redirects')
+NGINX_MAPS_PATH = os.path.join(ROOT_DIR, 'deploy', 'nginx-locale-maps.conf')
+NGINX_PATH = os.path.join(ROOT_DIR, 'deploy', 'nginx-locale.conf')
+EDGE_PATH = os.path.join(ROOT_DIR, 'deploy', 'locale-router.js')
+
+HEADER = 'Generated by sitegen/routing.py from each app\'s LANGUAGES - do not edit'
+
+
+def site_routes(apps):
+    """Return [(path, {code: dir})] for every app with localized pages.
+
+    apps is [(BASE_URL, languages)].
+    """
+    routes = []
+    for base_url, languages in apps:
+        locales = {lang['code']: lang['dir'] for lang in languages if lang['dir']}
+        if locales:
+            routes.append((urlparse(base_url).path.rstrip('/') + '/', locales))
+    return routes
+
+
+def first_language(accept_language):
+    """The first language tag of an Accept-Language header, as browsers send it."""
+    return (accept_language or '').split(',')[0].split(';')[0].strip()
+
+
+def locale_for(accept_language, cookie, locales):
+    """Locale directory for a request, or None to stay on the default page."""
+    if cookie == DEFAULT_LOCALE:
+        return None
+    if cookie in locales:
+        return locales[cookie]
+    tag = first_language(accept_language)
+    codes = {code.lower(): code for code in locales}
+    if tag.lower() in codes:
+        return locales[codes[tag.lower()]]
+    base = tag.split('-')[0].lower()
+    if base == 'zh':
+        code = 'zh-Hant' if TRADITIONAL_CHINESE_RE.match(tag) else 'zh-Hans'
+        return locales.get(code)
+    if base in codes:
+        return locales[codes[base]]
+    return None
+
+
+def accept_patterns(locales):
+    """Ordered (regex, dir) pairs matching the start of Accept-Language."""
+    end = r'(?:[,;]|$)'
+    patterns = []
+    for code, directory in locales.items():
+        patterns.append((rf'^\s*{re.escape(code)}{end}', directory))
+    if 'zh-Hant' in locales:
+        patterns.append((r'^\s*zh-(?:[^,;]*-)?(?:hant|tw|hk|mo)\b', locales['zh-Hant']))
+    if 'zh-Hans' in locales:
+        patterns.append((rf'^\s*zh(?:-|{end})', locales['zh-Hans']))
+    for code, directory in locales.items():
+        if '-' not in code:
+            patterns.append((rf'^\s*{re.escape(code)}-', directory))
+    return patterns
+
+
+def variable_name(path):
+    return re.sub(r'\W', '_', path.strip('/')).lower() or 'root'
+
+
+def nginx_maps(routes):
+    lines = [f'# {HEADER}', '# include in the http block; nginx-locale.conf uses these variables', '']
+    for path, locales in routes:
+        name = variable_name(path)
+        lines.append(f'map $http_accept_language ${name}_accept_locale {{')
+        lines.append('    default "";')
+        lines.extend(f'    "~*{pattern}" {directory};' for pattern, directory in accept_patterns(locales))
+        lines.append('}')
+        lines.append(f'map $cookie_{COOKIE_NAME} ${name}_locale {{')
+        lines.append(f'    default ${name}_accept_locale;')
+        lines.append(f'    {DEFAULT_LOCALE} "";')
+        lines.extend(f'    {code} {directory};' for code, directory in locales.items())
+        lines.append('}')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def nginx_locations(routes):
+    lines = [f'# {HEADER}', '# include in the server block for masawata.net (needs nginx-locale-maps.conf and nginx-headers-maps.conf)', '']
+    for path, _ in routes:
+        name = variable_name(path)
+        lines.append(f'location = {path} {{')
+        lines.append('    add_header Vary "Accept-Language, Cookie";')
+        # add_header lines here replace the server block's (nginx-headers.conf)
+        lines.append('    add_header Cache-Control $sitegen_cache_control;')
+        lines.append('    add_header Link $sitegen_link;')
+        lines.append(f'    if (${name}_locale) {{')
+        lines.append(f'        return 302 {path}${name}_locale/;')
+        lines.append('    }')
+        lines.append(f'    try_files {path}index.html =404;')
+        lines.append('}')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def netlify_languages(code):
+    """Language= values Netlify should match for a locale."""
+    if code == 'zh-Hant':
+        return ['zh-hant', 'zh-tw', 'zh-hk', 'zh-mo']
+    if code == 'zh-Hans':
+        return ['zh-hans', 'zh-cn', 'zh-sg', 'zh']
+    return [code.lower()]
+
+
+def redirects_file(routes):
+    lines = [f'# {HEADER}',
+             f'# A saved choice ({COOKIE_NAME} cookie) is handled by the page script', '']
+    for path, locales in routes:
+        lines.append(f'{path}  {path}index.html  200!  Cookie={COOKIE_NAME}')
+        # First match wins, so the catch-all zh (Simplified) rule goes last
+        for code, directory in sorted(locales.items(), key=lambda item: item[0] == 'zh-Hans'):
+            lines.append(f"{path}  {path}{directory}/  302!  Language={','.join(netlify_languages(code))}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def edge_function(routes):
+    table = {path: {'locales': locales, 'patterns': [pattern for pattern, _ in accept_patterns(locales)],
+                    'dirs': [directory for _, directory in accept_patterns(locales)]}
+             for path, locales in routes}
+    return f'''// {HEADER}
+// Redirects the default page of each app to the visitor's locale on the first request.
+
+const COOKIE = {json.dumps(COOKIE_NAME)};
+const DEFAULT_LOCALE = {json.dumps(DEFAULT_LOCALE)};
+const ROUTES = {json.dumps(table, indent=2)};
+
+export function localeFor(path, acceptLanguage, cookie) {{
+  const route = ROUTES[path];
+  if (!route || cookie === DEFAULT_LOCALE) return null;
+  if (cookie && Object.prototype.hasOwnProperty.call(route.locales, cookie)) return route.locales[cookie];
+  for (let i = 0; i < route.patterns.length; i++) {{
+    if (new RegExp(route.patterns[i], 'i').test(acceptLanguage || '')) return route.dirs[i];
+  }}
+  return null;
+}}
+
+function readCookie(header, name) {{
+  const match = (header || '').match(new RegExp('(?:^|;\\\\s*)' + name + '=([^;]*)'));
+  return match ? decodeURIComponent(match[1]) : null;
+}}
+
+export default async function (request, context) {{
+  const url = new URL(request.url);
+  const locale = localeFor(url.pathname, request.headers.get('accept-language'),
+                           readCookie(request.headers.get('cookie'), COOKIE));
+  if (locale) {{
+    return new Response(null, {{
+      status: 302,
+      headers: {{ Location: url.pathname + locale + '/', Vary: 'Accept-Language, Cookie' }},
+    }});
+  }}
+  return context && context.next ? context.next() : fetch(request);
+}}
+'''
+
+
+def write_routing(apps):
+    """Write the routing files for [(BASE_URL, languages)]; returns the changed paths."""
+    routes = site_routes(apps)
+    outputs = [(REDIRECTS_PATH, redirects_file(routes)), (NGINX_MAPS_PATH, nginx_maps(routes)),
+               (NGINX_PATH, nginx_locations(routes)), (EDGE_PATH, edge_function(routes))]
+    return [path for path, content in outputs if write_if_changed(path, content)]
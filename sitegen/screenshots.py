@@ -0,0 +1,132 @@
+"""
+Screenshot ingest
+
+App screenshots are exported as full-resolution PNG masters into
+images/<lang>/raw/ (e.g. "Action_Storyline.png", 1320px wide, with EXIF). With
+--ingest-screenshots the build turns each master into the web JPEG next to
+the raw/ directory, named by slugging the file name
+(images/en/action-storyline.jpg): resized to at most WIDTH pixels, flattened
+onto white, encoded at QUALITY and stripped of metadata. Apps can rename outputs with SCREENSHOT_NAMES in their build.py,
+e.g. {'My Fitness Map': 'fitness-map'}.
+
+Masters are cached by signature and content hash in
+.build-cache/screenshots.json, so only new or changed masters are encoded
+(in a process pool with --jobs). Web copies that exist before a master was
+ever ingested are adopted as they are rather than re-encoded, and removing a
+master leaves its web copy in place.
+
+Requires Pillow (pip install Pillow); without it the existing web copies are
+used unchanged.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import ROOT_DIR
+from .files import cached_file_hash, file_hash, file_signature, load_json, save_json
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CACHE_PATH = os.path.join(ROOT_DIR, '.build-cache', 'screenshots.json')
+
+RAW_DIR = 'raw'
+MASTER_EXTENSIONS = ('.png',)
+WIDTH = 660
+QUALITY = 85
+BACKGROUND = (255, 255, 255)
+
+
+def available():
+    return Image is not None
+
+
+def slug(name):
+    """Web name for a master: 'Action_Workout organized by tags' -> 'action-workout-organized-by-tags'."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def is_master(filepath):
+    return (os.path.basename(os.path.dirname(filepath)) == RAW_DIR
+            and filepath.lower().endswith(MASTER_EXTENSIONS))
+
+
+def find_masters(app_dir):
+    """Return every master under the app's images/<lang>/raw/ directories, sorted."""
+    masters = []
+    for dirpath, _, filenames in os.walk(os.path.join(app_dir, 'images')):
+        masters.extend(os.path.join(dirpath, filename) for filename in filenames
+                       if is_master(os.path.join(dirpath, filename)))
+    return sorted(masters)
+
+
+def output_path(master, names=None):
+    stem = os.path.splitext(os.path.basename(master))[0]
+    name = (names or {}).get(stem) or slug(stem)
+    return os.path.join(os.path.dirname(os.path.dirname(master)), f'{name}.jpg')
+
+
+def encode(master, output):
+    """Resize, flatten and encode one master (runs in worker processes)."""
+    with Image.open(master) as im:
+        im.load()
+        if im.width > WIDTH:
+            im = im.resize((WIDTH, round(im.height * WIDTH / im.width)), Image.LANCZOS)
+        if 'A' in im.getbands() or 'transparency' in im.info:
+            rgba = im.convert('RGBA')
+            im = Image.new('RGB', rgba.size, BACKGROUND)
+            im.paste(rgba, mask=rgba.getchannel('A'))
+        else:
+            im = im.convert('RGB')
+        # No exif/icc_profile arguments, so the JPEG carries no metadata
+        im.save(output, 'JPEG', quality=QUALITY, optimize=True, progressive=True)
+    return file_hash(output)
+
+
+def ingest(apps, jobs=1):
+    """Bring the web copies of every master up to date.
+
+    apps is [(app_dir, SCREENSHOT_NAMES or None)]. Returns (masters, stale):
+    stale masters are encoded when Pillow is installed.
+    """
+    index = load_json(CACHE_PATH, {})
+    outputs = {}
+    stale = []
+    for app_dir, names in apps:
+        for master in find_masters(app_dir):
+            output = output_path(master, names)
+            if output in outputs:
+                raise ValueError(f'{os.path.relpath(master, ROOT_DIR)} and {os.path.relpath(outputs[output], ROOT_DIR)} '
+                                 f'both map to {os.path.relpath(output, ROOT_DIR)}')
+            outputs[output] = master
+            rel = os.path.relpath(master, ROOT_DIR)
+            entry = index.get(rel)
+            if entry is None and os.path.exists(output):
+                # A web copy made before ingest existed; keep it until the master changes
+                index[rel] = {'hash': cached_file_hash(master), 'signature': file_signature(master),
+                              'output': os.path.relpath(output, ROOT_DIR), 'output_hash': cached_file_hash(output)}
+            elif not (entry and entry['output'] == os.path.relpath(output, ROOT_DIR)
+                      and entry['output_hash'] == cached_file_hash(output)
+                      and (entry['signature'] == file_signature(master) or entry['hash'] == cached_file_hash(master))):
+                stale.append((master, output))
+
+    if stale and Image is not None:
+        if jobs > 1 and len(stale) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(encode, *zip(*stale)))
+        else:
+            results = [encode(master, output) for master, output in stale]
+        for (master, output), output_hash in zip(stale, results):
+            index[os.path.relpath(master, ROOT_DIR)] = {
+                'hash': cached_file_hash(master), 'signature': file_signature(master),
+                'output': os.path.relpath(output, ROOT_DIR), 'output_hash': output_hash}
+    # Removing a master keeps its web copy, which pages may still use
+    masters = {os.path.relpath(master, ROOT_DIR) for master in outputs.values()}
+    app_prefixes = tuple(os.path.relpath(app_dir, ROOT_DIR) + os.sep for app_dir, _ in apps)
+    for rel in [rel for rel in index if rel.startswith(app_prefixes) and rel not in masters]:
+        del index[rel]
+    save_json(CACHE_PATH, index)
+    return len(outputs), len(stale)
@@ -0,0 +1,95 @@
+"""
+Local preview server with live reload
+
+Serves the repository root (so pages live at the same paths as on
+masawata.net, e.g. http://localhost:8000/FitnessStory/ja/) and injects a
+small script into every HTML page that listens on a server-sent events
+stream. notify_reload() tells every open page to reload itself.
+"""
+
+import http.server
+import os
+import threading
+
+from .config import ROOT_DIR
+
+RELOAD_PATH = '/__livereload'
+RELOAD_SCRIPT = (b'<script>new EventSource("' + RELOAD_PATH.encode() + b'")'
+                 b'.onmessage = function () { location.reload(); };</script>')
+
+# Seconds between keep-alive comments on idle event streams
+KEEPALIVE = 15
+
+_version = 0
+_changed = threading.Condition()
+
+
+def notify_reload():
+    """Tell every connected page to reload."""
+    global _version
+    with _changed:
+        _version += 1
+        _changed.notify_all()
+
+
+class PreviewHandler(http.server.SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=ROOT_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            self.send_events()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split('?')[0].endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if path.endswith('.html') and os.path.isfile(path):
+            self.send_page(path)
+        else:
+            super().do_GET()
+
+    def send_page(self, path):
+        with open(path, 'rb') as f:
+            body = f.read()
+        if b'</body>' in body:
+            body = body.replace(b'</body>', RELOAD_SCRIPT + b'</body>', 1)
+        else:
+            body += RELOAD_SCRIPT
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        with _changed:
+            seen = _version
+        try:
+            while True:
+                with _changed:
+                    _changed.wait_for(lambda: _version != seen, timeout=KEEPALIVE)
+                    current = _version
+                if current != seen:
+                    seen = current
+                    self.wfile.write(b'data: reload\n\n')
+                else:
+                    self.wfile.write(b': keep-alive\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def start_server(port):
+    """Start the preview server in a background thread."""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), PreviewHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,231 @@
+"""
+Service worker and precache manifest
+
+With --service-worker every app gets <app>/sw.js, registered by each of its
+pages (except on localhost, like GOOGLE_ANALYTICS), with a precache manifest
+built from the assets its pages actually reference:
+
+    ASSETS    every local asset a page references, with its content hash
+    PRECACHE  per page (locale), the assets it loads eagerly: stylesheets,
+              scripts, preloads, icons, the sprite and non-lazy images
+
+The worker precaches the eager assets of the pages open when it installs and
+of every page the visitor navigates to afterwards. Pages are served
+stale-while-revalidate: the cached copy right away, refreshed from the
+network for the next visit. Assets in ASSETS and fingerprinted copies
+(style.1a2b3c4d.css) are served cache-first. Assets without a hash in their
+name are cached under their content hash, so a changed file is fetched again.
+
+sw.js only changes when the referenced assets do, and a new version drops
+the cached pages (they may point at replaced copies) and unreferenced assets
+once it takes over. Each page's manifest entry records its assets, so pages
+that are up to date keep theirs when only some pages are rebuilt; asset
+hashes are cached by file signature in .build-cache/service-worker.json.
+"""
+
+import hashlib
+import json
+import os
+import re
+from urllib.parse import quote
+
+from .budgets import FETCHED_RELS, TAG_RE
+from .config import ROOT_DIR
+from .files import file_hash, file_signature, load_json, local_path, save_json, write_if_changed
+from .markup import NOSCRIPT_RE, attributes, in_picture, srcset_urls
+
+SW_NAME = 'sw.js'
+CACHE_PATH = os.path.join(ROOT_DIR, '.build-cache', 'service-worker.json')
+HASH_LENGTH = 8
+
+REGISTRATION = '''<script>
+  if ('serviceWorker' in navigator && location.hostname !== 'localhost' && location.hostname !== '127.0.0.1') {
+    addEventListener('load', function () { navigator.serviceWorker.register(%(url)s); });
+  }
+</script>'''
+
+WORKER = '''// Generated by sitegen/serviceworker.py from the assets the pages reference; do not edit
+const PREFIX = %(prefix)s;
+const VERSION = %(version)s;
+const ASSETS = %(assets)s;
+const PRECACHE = %(precache)s;
+
+const HTML_CACHE = PREFIX + 'html-' + VERSION;
+const ASSET_CACHE = PREFIX + 'assets';
+const HASHED_RE = /\\.[0-9a-f]{%(hash_length)d}\\.\\w+$/;
+const BASE = self.registration.scope;
+// Revalidate with the server: the HTTP cache may still hold an older copy of an asset without a hash
+const FETCH_OPTIONS = {cache: 'no-cache'};
+
+// Path relative to the app, or null outside of it
+function relative(url) {
+  return url.startsWith(BASE) ? url.slice(BASE.length).split(/[?#]/)[0] : null;
+}
+
+function pagePath(path) {
+  return path.replace(/(^|\\/)index\\.html$/, '$1');
+}
+
+// Fingerprinted names change with their content; other assets are keyed by their hash
+function assetKey(path) {
+  return HASHED_RE.test(path) || !(path in ASSETS) ? BASE + path : BASE + path + '?rev=' + ASSETS[path];
+}
+
+async function precache(page) {
+  const cache = await caches.open(ASSET_CACHE);
+  await Promise.all((PRECACHE[page] || []).map(async path => {
+    if (await cache.match(assetKey(path))) return;
+    const response = await fetch(BASE + path, FETCH_OPTIONS);
+    if (response.ok) await cache.put(assetKey(path), response);
+  }));
+}
+
+async function cacheFirst(request, key) {
+  const cache = await caches.open(ASSET_CACHE);
+  const cached = await cache.match(key);
+  if (cached) return cached;
+  const response = await fetch(request, FETCH_OPTIONS);
+  if (response.ok) await cache.put(key, response.clone());
+  return response;
+}
+
+self.addEventListener('install', event => {
+  event.waitUntil(self.clients.matchAll({type: 'window', includeUncontrolled: true}).then(clients =>
+    Promise.all(clients.map(client => relative(client.url)).filter(path => path !== null)
+      .map(path => precache(pagePath(path))))));
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    for (const name of await caches.keys()) {
+      if (name.startsWith(PREFIX) && name !== HTML_CACHE && name !== ASSET_CACHE) await caches.delete(name);
+    }
+    const cache = await caches.open(ASSET_CACHE);
+    const keep = new Set(Object.keys(ASSETS).map(assetKey));
+    for (const request of await cache.keys()) {
+      if (!keep.has(request.url)) await cache.delete(request);
+    }
+    await self.clients.claim();
+  })());
+});
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  const path = request.method === 'GET' ? relative(request.url) : null;
+  if (path === null) return;
+  if (request.mode === 'navigate') {
+    // Stale-while-revalidate; the copy is taken before the page body is read
+    const key = BASE + pagePath(path);
+    const network = fetch(request);
+    const copy = network.then(response => response.ok ? response.clone() : null);
+    event.respondWith(caches.open(HTML_CACHE).then(cache => cache.match(key)).then(cached => cached || network));
+    event.waitUntil(copy.then(response => response && caches.open(HTML_CACHE).then(cache => cache.put(key, response)))
+      .catch(() => {}));
+    event.waitUntil(precache(pagePath(path)).catch(() => {}));
+  } else if (HASHED_RE.test(path) || path in ASSETS) {
+    event.respondWith(cacheFirst(request, assetKey(path)));
+  }
+});
+'''
+
+
+def sw_path(app_dir):
+    return os.path.join(app_dir, SW_NAME)
+
+
+def url_path(filepath, app_dir):
+    """URL of a file relative to the app, as the worker sees it in requests."""
+    return quote(os.path.relpath(filepath, app_dir).replace(os.sep, '/'))
+
+
+def page_path(page_dir, app_dir):
+    """A page's URL path within the app: '' for the default locale, 'ja/' for the others."""
+    path = url_path(page_dir, app_dir)
+    return '' if path == '.' else path + '/'
+
+
+def page_assets(html, page_dir, app_dir):
+    """Return (eager, lazy): the app's local files a page loads right away and on demand."""
+    html = NOSCRIPT_RE.sub('', html)
+    eager = set()
+    lazy = set()
+
+    def add(url, urls):
+        filepath = local_path(url, page_dir)
+        if filepath and filepath.startswith(app_dir + os.sep) and not filepath.endswith('.html'):
+            urls.add(filepath)
+
+    for match in TAG_RE.finditer(html):
+        name = match.group(1).lower()
+        attrs = attributes(match.group(0))
+        if name == 'link':
+            if attrs.get('href') and set((attrs.get('rel') or '').lower().split()) & FETCHED_RELS:
+                add(attrs['href'], eager)
+        elif name in ('script', 'use'):
+            url = attrs.get('src') or (attrs.get('href') or '').split('#')[0]
+            if url:
+                add(url, eager)
+        elif name == 'img':
+            # Inside <picture> the browser usually picks a <source> over the <img> fallback
+            deferred = attrs.get('loading') == 'lazy' or in_picture(html, match.start())
+            if attrs.get('src'):
+                add(attrs['src'], lazy if deferred else eager)
+            for url in srcset_urls(attrs.get('srcset') or ''):
+                add(url, lazy)
+        else:
+            for url in [attrs.get('src'), attrs.get('poster')] + srcset_urls(attrs.get('srcset') or ''):
+                if url:
+                    add(url, lazy)
+    return eager, lazy - eager
+
+
+def registration(sw_url, indent=''):
+    script = REGISTRATION % {'url': json.dumps(sw_url)}
+    return ''.join(f'{indent}{line}\n' for line in script.splitlines())
+
+
+def add_registration(html, sw_url):
+    """Register the app's service worker at the end of a page's <body>."""
+    body_end = html.rfind('</body>')
+    if body_end == -1:
+        return html
+    line_start = html.rfind('\n', 0, body_end) + 1
+    if html[line_start:body_end].strip():
+        return html[:body_end] + registration(sw_url) + html[body_end:]
+    previous = html[html.rfind('\n', 0, max(line_start - 1, 0)) + 1:line_start]
+    return html[:line_start] + registration(sw_url, re.match(r'[ \t]*', previous).group(0)) + html[line_start:]
+
+
+def write_service_worker(app_dir, name, pages):
+    """Write the app's sw.js for {page path: (eager, lazy) files}; returns (changed, assets).
+
+    page path is relative to the app ('' for the default locale, 'ja/').
+    """
+    index = load_json(CACHE_PATH, {})
+    hashes = {}
+    used = set()
+    for filepath in sorted(set().union(*(eager | lazy for eager, lazy in pages.values()))):
+        rel = os.path.relpath(filepath, ROOT_DIR)
+        signature = file_signature(filepath)
+        if signature is None:
+            continue
+        if not index.get(rel) or index[rel]['signature'] != signature:
+            index[rel] = {'signature': signature, 'hash': file_hash(filepath)}
+        used.add(rel)
+        hashes[url_path(filepath, app_dir)] = index[rel]['hash'][:HASH_LENGTH]
+    app_prefix = os.path.relpath(app_dir, ROOT_DIR) + os.sep
+    for rel in [rel for rel in index if rel.startswith(app_prefix) and rel not in used]:
+        del index[rel]
+    save_json(CACHE_PATH, index)
+
+    precache = {page: sorted(url_path(filepath, app_dir) for filepath in eager if url_path(filepath, app_dir) in hashes)
+                for page, (eager, _) in pages.items()}
+    manifest = json.dumps({'assets': hashes, 'precache': precache}, sort_keys=True)
+    worker = WORKER % {
+        'prefix': json.dumps(f'{name}-'),
+        'version': json.dumps(hashlib.sha256(manifest.encode('utf-8')).hexdigest()[:12]),
+        'assets': json.dumps(hashes, indent=2, sort_keys=True),
+        'precache': json.dumps(precache, indent=2, sort_keys=True),
+        'hash_length': HASH_LENGTH,
+    }
+    return write_if_changed(sw_path(app_dir), worker), hashes
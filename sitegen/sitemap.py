@@ -0,0 +1,129 @@
+"""
+Sitemap generation
+
+Sitemaps are streamed to disk one <url> entry at a time. The hreflang
+alternates block is identical for every page of an app, so it is built once
+instead of once per URL. When an app outgrows the protocol limits (50,000
+URLs or 50 MB uncompressed per file), the entries are split across
+sitemap-1.xml, sitemap-2.xml, ... and sitemap.xml becomes a sitemap index
+pointing at them. --compress writes .xml.gz copies along with the rest of
+the output (see compress.py).
+
+lastmod comes from the engine, which only moves it when a page's rendered
+content changes, so crawlers re-fetch just the pages that changed.
+"""
+
+import os
+import re
+
+from .files import replace_if_changed, write_if_changed
+from .fragments import page_url
+
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+URLSET_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:xhtml="http://www.w3.org/1999/xhtml">
+'''
+URLSET_FOOTER = '</urlset>'
+INDEX_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+'''
+INDEX_FOOTER = '</sitemapindex>'
+
+LASTMOD_RE = re.compile(r'<loc>([^<]+)</loc>\s*<lastmod>([^<]+)</lastmod>')
+
+
+def alternates_block(base_url, languages):
+    """The <xhtml:link> alternates shared by every <url> of an app."""
+    lines = [f'        <xhtml:link rel="alternate" hreflang="{lang["code"]}" href="{page_url(base_url, lang)}"/>\n'
+             for lang in languages]
+    lines.append(f'        <xhtml:link rel="alternate" hreflang="x-default" href="{base_url}/"/>\n')
+    return ''.join(lines)
+
+
+def url_entry(loc, lastmod, priority, alternates):
+    return f'''
+    <url>
+        <loc>{loc}</loc>
+        <lastmod>{lastmod}</lastmod>
+        <changefreq>weekly</changefreq>
+        <priority>{priority}</priority>
+{alternates}    </url>
+'''
+
+
+def sitemap_entries(base_url, languages, lastmods):
+    """Yield (lastmod, entry) for every page of an app."""
+    alternates = alternates_block(base_url, languages)
+    for lang in languages:
+        loc = page_url(base_url, lang)
+        priority = '1.0' if lang['code'] == 'en' else '0.9'
+        yield lastmods[lang['code']], url_entry(loc, lastmods[lang['code']], priority, alternates)
+
+
+def read_lastmods(directory):
+    """Return {loc: lastmod} from the sitemaps an earlier build left behind."""
+    lastmods = {}
+    for filename in sorted(os.listdir(directory)):
+        if re.fullmatch(r'sitemap(-\d+)?\.xml', filename):
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                lastmods.update(LASTMOD_RE.findall(f.read()))
+    return lastmods
+
+
+def write_sitemaps(directory, base_url, entries):
+    """Stream (lastmod, entry) tuples into sitemap.xml.
+
+    Entries are split into sitemap-N.xml files when they exceed the protocol
+    limits, with sitemap.xml as their index. Returns (files, changed): the
+    sitemap files now in place and whether any of them changed.
+    """
+    chunks = []
+    f = None
+    count = size = 0
+    for lastmod, entry in entries:
+        data = entry.encode('utf-8')
+        if f is None or count == MAX_URLS or size + len(data) + len(URLSET_FOOTER) > MAX_BYTES:
+            if f is not None:
+                f.write(URLSET_FOOTER.encode('utf-8'))
+                f.close()
+            chunks.append([os.path.join(directory, f'sitemap-{len(chunks) + 1}.xml.tmp'), lastmod])
+            f = open(chunks[-1][0], 'wb')
+            f.write(URLSET_HEADER.encode('utf-8'))
+            count, size = 0, len(URLSET_HEADER)
+        f.write(data)
+        count += 1
+        size += len(data)
+        chunks[-1][1] = max(chunks[-1][1], lastmod)
+    if f is None:
+        return [], False
+    f.write(URLSET_FOOTER.encode('utf-8'))
+    f.close()
+
+    # A single file is the sitemap itself; several get an index
+    index_path = os.path.join(directory, 'sitemap.xml')
+    if len(chunks) == 1:
+        files = [index_path]
+        changed = replace_if_changed(chunks[0][0], index_path)
+    else:
+        files = [index_path]
+        changed = False
+        for tmp_path, _ in chunks:
+            files.append(tmp_path[:-len('.tmp')])
+            changed = replace_if_changed(tmp_path, files[-1]) or changed
+        base = base_url.rstrip('/')
+        index = INDEX_HEADER + ''.join(
+            f'    <sitemap>\n        <loc>{base}/{os.path.basename(path)}</loc>\n'
+            f'        <lastmod>{lastmod}</lastmod>\n    </sitemap>\n'
+            for path, (_, lastmod) in zip(files[1:], chunks)) + INDEX_FOOTER
+        changed = write_if_changed(index_path, index) or changed
+
+    # Remove split files left over from a build with more pages
+    for filename in os.listdir(directory):
+        match = re.fullmatch(r'(sitemap-\d+\.xml)(\.gz)?', filename)
+        if match and os.path.join(directory, match.group(1)) not in files:
+            os.remove(os.path.join(directory, filename))
+            changed = True
+    return files, changed
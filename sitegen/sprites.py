@@ -0,0 +1,85 @@
+"""
+SVG sprite sheet
+
+Inline <svg> icons are repeated in every page of every locale (the FAQ
+chevron once per question). With --sprite, each icon's drawing moves into a
+<symbol> of one sprite per app, <app>/icons.svg, and the page keeps only
+
+    <svg class="faq__icon" viewBox="0 0 24 24" fill="none" stroke="currentColor"><use href="icons.svg#i-1a2b3c4d"/></svg>
+
+The outer <svg> keeps all its attributes, so CSS, sizing and the inherited
+fill/stroke/currentColor work as before. Symbols are named by a hash of their
+viewBox and content, so identical icons share one symbol. Icons with ids,
+nested <svg> or <use> stay inline.
+
+Each page's manifest entry records the symbols it uses; the sprite holds the
+symbols used by the app's current pages, so pages that are up to date keep
+theirs when only some pages are rebuilt.
+"""
+
+import hashlib
+import os
+import re
+
+from .files import write_if_changed
+
+SPRITE_NAME = 'icons.svg'
+
+SVG_RE = re.compile(r'<svg\b([^>]*)>(.*?)</svg>', re.DOTALL | re.IGNORECASE)
+VIEWBOX_RE = re.compile(r'\bviewBox="([^"]+)"')
+SYMBOL_RE = re.compile(r'<symbol id="([^"]+)"[^>]*>.*?</symbol>', re.DOTALL)
+# Content that can't move into a sprite: referenced ids, nested viewports and references
+INLINE_ONLY_RE = re.compile(r'\bid=|<svg\b|<use\b', re.IGNORECASE)
+
+
+def sprite_path(app_dir):
+    return os.path.join(app_dir, SPRITE_NAME)
+
+
+def symbol_id(view_box, content):
+    return 'i-' + hashlib.sha256(f'{view_box}\n{content}'.encode('utf-8')).hexdigest()[:8]
+
+
+def read_sprite(filepath):
+    """Return {id: <symbol> markup} from a sprite written by write_sprite()."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = f.read()
+    except OSError:
+        return {}
+    return {match.group(1): match.group(0) for match in SYMBOL_RE.finditer(data)}
+
+
+def extract_icons(html, sprite_url, symbols):
+    """Replace a page's inline icons with references into the sprite.
+
+    New symbols are added to symbols; returns (html, ids of the symbols the page uses).
+    """
+    used = set()
+
+    def replace(match):
+        attrs, content = match.groups()
+        view_box = VIEWBOX_RE.search(attrs)
+        if not view_box or INLINE_ONLY_RE.search(content):
+            return match.group(0)
+        content = re.sub(r'>\s+<', '><', content.strip())
+        icon = symbol_id(view_box.group(1), content)
+        symbols.setdefault(icon, f'<symbol id="{icon}" viewBox="{view_box.group(1)}">{content}</symbol>')
+        used.add(icon)
+        return f'<svg{attrs}><use href="{sprite_url}#{icon}"/></svg>'
+
+    return SVG_RE.sub(replace, html), used
+
+
+def write_sprite(filepath, symbols):
+    """Write the sprite with the given {id: <symbol>} (sorted, so it only changes with its icons).
+
+    Returns True when the file changed; an app without icons has no sprite.
+    """
+    if not symbols:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+            return True
+        return False
+    lines = ['<svg xmlns="http://www.w3.org/2000/svg">'] + [symbols[icon] for icon in sorted(symbols)] + ['</svg>']
+    return write_if_changed(filepath, '\n'.join(lines) + '\n')
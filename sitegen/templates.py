@@ -0,0 +1,88 @@
+"""
+Precompiled page templates
+
+Templates are plain HTML files with {{ name }} or {{ name.key.key }} slots.
+A template is compiled once into its static segments and slots; slots whose
+root name is a build constant (GOOGLE_ANALYTICS, BASE_URL, ...) are folded
+into the static segments at compile time, so rendering a locale only fills
+the locale-dependent slots. Compiled templates are cached in memory and on
+disk, keyed by the hash of the template source, the constants and this
+compiler (so a change to the compiled format never reuses stale entries).
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from .config import ROOT_DIR
+from .files import cached_file_hash, load_json, save_json
+
+CACHE_DIR = os.path.join(ROOT_DIR, '.build-cache', 'templates')
+
+SLOT_RE = re.compile(r'\{\{\s*([A-Za-z_][\w-]*(?:\.[\w-]+)*)\s*\}\}')
+
+# Compiled templates loaded in this process, keyed by cache key
+_compiled = {}
+
+
+def resolve(context, path):
+    value = context
+    for key in path.split('.'):
+        value = value[key]
+    return value
+
+
+def compile_template(source, constants=None):
+    """Split a template into static segments and slot paths.
+
+    Returns {'statics': [...], 'slots': [...]} with one more static segment
+    than slots. Slots rooted in constants are resolved here.
+    """
+    constants = constants or {}
+    statics = []
+    slots = []
+    current = []
+    pos = 0
+    for match in SLOT_RE.finditer(source):
+        current.append(source[pos:match.start()])
+        path = match.group(1)
+        if path.split('.')[0] in constants:
+            current.append(str(resolve(constants, path)))
+        else:
+            statics.append(''.join(current))
+            slots.append(path)
+            current = []
+        pos = match.end()
+    current.append(source[pos:])
+    statics.append(''.join(current))
+    return {'statics': statics, 'slots': slots}
+
+
+def load_template(filepath, constants=None):
+    """Load a compiled template, compiling it only if the source changed."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        source = f.read()
+    h = hashlib.sha256(cached_file_hash(os.path.abspath(__file__)).encode('utf-8'))
+    h.update(source.encode('utf-8'))
+    h.update(json.dumps(constants or {}, sort_keys=True).encode('utf-8'))
+    key = h.hexdigest()
+
+    if key not in _compiled:
+        cache_path = os.path.join(CACHE_DIR, f'{key}.json')
+        compiled = load_json(cache_path)
+        if compiled is None:
+            compiled = compile_template(source, constants)
+            save_json(cache_path, compiled)
+        _compiled[key] = compiled
+    return _compiled[key]
+
+
+def render(compiled, context):
+    statics = compiled['statics']
+    parts = [statics[0]]
+    for path, static in zip(compiled['slots'], statics[1:]):
+        parts.append(str(resolve(context, path)))
+        parts.append(static)
+    return ''.join(parts)
+
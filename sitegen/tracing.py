@@ -0,0 +1,142 @@
+"""
+Build profiling
+
+The engine wraps every build phase and every locale in span(name, ...).
+Until enable() is called a span is a shared no-op context manager, so builds
+without --profile pay nothing beyond a None check per span.
+
+When enabled, spans are recorded as Chrome trace events (open the file in
+chrome://tracing or https://ui.perfetto.dev), summarized as a table of hot
+spots by self time, and optionally each top-level phase runs under cProfile
+with its stats written to <phase>.prof. Worker processes record their own
+spans and hand them back with collect(); perf_counter is system-wide, so
+their timestamps line up with the main process.
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from .files import write_if_changed
+
+NULL_SPAN = nullcontext()
+
+# Spans shown in the summary table
+TOP_SPANS = 15
+
+# Recorded events while tracing (None when off), and the cProfile state
+_events = None
+_profilers = None
+_active_profiler = None
+
+
+def enable(cprofile=False):
+    """Start recording spans (and per-phase cProfile stats)."""
+    global _events, _profilers
+    _events = []
+    _profilers = {} if cprofile else None
+
+
+def enabled():
+    return _events is not None
+
+
+def span(name, category='phase', **args):
+    """Time a block as a trace span; a no-op unless tracing is enabled."""
+    if _events is None:
+        return NULL_SPAN
+    return _span(name, category, args)
+
+
+@contextmanager
+def _span(name, category, args):
+    global _active_profiler
+    # cProfile allows one active profiler, so only the outermost phase gets one
+    profiler = None
+    if _profilers is not None and _active_profiler is None and category == 'phase':
+        profiler = _active_profiler = _profilers.setdefault(name, cProfile.Profile())
+        profiler.enable()
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        if profiler:
+            profiler.disable()
+            _active_profiler = None
+        _events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': start / 1000, 'dur': (end - start) / 1000,
+                        'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args})
+
+
+def collect():
+    """Return and clear the spans recorded so far (used by worker processes)."""
+    events = list(_events or [])
+    if _events is not None:
+        _events[:] = []
+    return events
+
+
+def add(events):
+    """Merge spans recorded in a worker process."""
+    if _events is not None:
+        _events.extend(events)
+
+
+def self_times(events):
+    """Each span's duration minus the time spent in spans nested inside it."""
+    result = {}
+    threads = {}
+    for i, event in enumerate(events):
+        threads.setdefault((event['pid'], event['tid']), []).append(i)
+    for indices in threads.values():
+        indices.sort(key=lambda i: (events[i]['ts'], -events[i]['dur']))
+        stack = []
+        for i in indices:
+            event = events[i]
+            while stack and events[stack[-1]]['ts'] + events[stack[-1]]['dur'] <= event['ts']:
+                stack.pop()
+            result[i] = event['dur']
+            if stack:
+                result[stack[-1]] -= event['dur']
+            stack.append(i)
+    return result
+
+
+def summary(events):
+    """Rows of (name, calls, total us, self us), slowest self time first."""
+    rows = {}
+    for i, own in self_times(events).items():
+        row = rows.setdefault(events[i]['name'], [events[i]['name'], 0, 0.0, 0.0])
+        row[1] += 1
+        row[2] += events[i]['dur']
+        row[3] += own
+    return sorted(rows.values(), key=lambda row: -row[3])
+
+
+def report(trace_path, cprofile_dir=None):
+    """Write the trace (and cProfile stats) and print the hot spots table."""
+    events = sorted(_events, key=lambda event: event['ts'])
+    if events:
+        origin = events[0]['ts']
+        events = [dict(event, ts=event['ts'] - origin) for event in events]
+    main_pid = os.getpid()
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                 'args': {'name': 'sitegen' if pid == main_pid else f'sitegen worker {pid}'}}
+                for pid in sorted({event['pid'] for event in events})]
+    write_if_changed(trace_path, json.dumps({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}))
+
+    total = sum(event['dur'] for event in events if event['name'] == 'build') or 1
+    print(f"\n{'Span':<24} {'Calls':>6} {'Total ms':>10} {'Self ms':>10} {'Self %':>7}")
+    for name, calls, total_us, self_us in summary(events)[:TOP_SPANS]:
+        print(f'{name:<24} {calls:>6} {total_us / 1000:>10.1f} {self_us / 1000:>10.1f} {self_us / total * 100:>6.1f}%')
+    print(f'\nTrace: {os.path.relpath(trace_path)} (open in chrome://tracing or ui.perfetto.dev)')
+
+    if cprofile_dir and _profilers:
+        os.makedirs(cprofile_dir, exist_ok=True)
+        for name, profiler in sorted(_profilers.items()):
+            profiler.dump_stats(os.path.join(cprofile_dir, f'{name}.prof'))
+        print(f"cProfile: {', '.join(sorted(_profilers))} in {os.path.relpath(cprofile_dir)}/ "
+              f'(inspect with python3 -m pstats <file>.prof)')
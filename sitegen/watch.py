@@ -0,0 +1,125 @@
+"""
+Watch mode
+
+Builds once, starts the preview server and then polls the inputs of every
+page. An in-memory dependency graph maps each input to the pages it affects:
+
+    locales/<code>.json           that locale's page
+    build.py, templates/*.html    every page of the app (the app is reloaded)
+    files in a page's manifest    the pages that used them (images, CSS, ...)
+    assets added or removed       every page of the app (locale fallbacks may change)
+    images/<lang>/raw/*.png       re-encoded into web copies (with --ingest-screenshots), which
+                                  are then picked up as above
+
+Only the affected pages are rebuilt, then every open browser tab reloads.
+Edits to other served files (CSS, JS, images not baked into a page) just
+reload the browser. Editing sitegen/ itself restarts the watcher.
+"""
+
+import glob
+import os
+import sys
+import time
+
+from . import assets, engine, screenshots
+from .config import ROOT_DIR
+from .files import file_signature, load_json
+from .server import notify_reload, start_server
+
+POLL_INTERVAL = 0.25
+
+# Directories of an app whose files are build inputs or served as-is
+WATCH_DIRS = ('locales', 'templates', 'css', 'js', 'images', 'assets', 'fonts')
+
+# Directory of the image variants the build writes (see images.py)
+VARIANTS_PART = f'{os.sep}_variants{os.sep}'
+
+
+def dependency_graph(app_dirs):
+    """Map each input file to the set of (app_dir, lang_code) pages it affects."""
+    graph = {}
+    for app_dir in app_dirs:
+        app = engine.load_app(app_dir)
+        pages = {(app.SCRIPT_DIR, lang['code']) for lang in engine.app_languages(app)}
+        for filepath in [os.path.join(app.SCRIPT_DIR, 'build.py')] + glob.glob(
+                os.path.join(app.SCRIPT_DIR, 'templates', '*.html')):
+            graph.setdefault(filepath, set()).update(pages)
+        entries = load_json(engine.manifest_path(app), {}).get('pages', {})
+        for _, code in pages:
+            graph.setdefault(engine.locale_path(app, code), set()).add((app.SCRIPT_DIR, code))
+            for rel in entries.get(code, {}).get('deps', {}):
+                graph.setdefault(os.path.join(ROOT_DIR, rel), set()).add((app.SCRIPT_DIR, code))
+    return graph
+
+
+def watched_files(app_dirs, graph):
+    """Every file whose change needs a rebuild or a browser reload."""
+    files = set(graph) | set(glob.glob(os.path.join(engine.SITEGEN_DIR, '*.py')))
+    for app_dir in app_dirs:
+        for name in WATCH_DIRS:
+            for dirpath, dirnames, filenames in os.walk(os.path.join(app_dir, name)):
+                files.update(os.path.join(dirpath, filename) for filename in filenames)
+    return {filepath for filepath in files
+            if not assets.GENERATED_RE.search(os.path.basename(filepath)) and VARIANTS_PART not in filepath}
+
+
+def snapshot(files):
+    return {filepath: file_signature(filepath) for filepath in files}
+
+
+def watch(app_dirs, options, port=8000):
+    """Build, serve on localhost:port and rebuild affected pages on every change."""
+    engine.build_site(app_dirs, **options)
+    options = dict(options, force=False)
+    start_server(port)
+    graph = dependency_graph(app_dirs)
+    signatures = snapshot(watched_files(app_dirs, graph))
+    first_app = os.path.basename(app_dirs[0])
+    print(f'\nWatching {len(signatures)} files - preview at http://localhost:{port}/{first_app}/ '
+          f'(Ctrl+C to stop)\n')
+
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot(watched_files(app_dirs, graph))
+            changed = sorted(f for f in set(signatures) | set(current) if signatures.get(f) != current.get(f))
+            added_or_removed = set(signatures) ^ set(current)
+            signatures = current
+            if not changed:
+                continue
+
+            names = ', '.join(os.path.relpath(f, ROOT_DIR) for f in changed)
+            if any(os.path.dirname(f) == engine.SITEGEN_DIR for f in changed):
+                print(f'Changed: {names} - restarting')
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+
+            # Apps whose build.py or templates changed are re-imported
+            for app_dir in app_dirs:
+                if any(f == os.path.join(app_dir, 'build.py') or os.path.dirname(f) == os.path.join(app_dir, 'templates')
+                       for f in changed):
+                    engine.unload_app(app_dir)
+
+            start = time.perf_counter()
+            if options.get('ingest_screenshots') and any(screenshots.is_master(f) for f in changed):
+                # The web copies written from the masters are changed inputs too
+                engine.process_screenshots(app_dirs, options['jobs'])
+                current = snapshot(watched_files(app_dirs, graph))
+                encoded = {f for f in set(signatures) | set(current) if signatures.get(f) != current.get(f)}
+                changed = sorted(set(changed) | encoded)
+                added_or_removed |= set(signatures) ^ set(current)
+                signatures = current
+            pages = set().union(*(graph.get(f, set()) for f in changed))
+            # A new or deleted asset can change which file a locale falls back to
+            for app_dir in app_dirs:
+                asset_dirs = tuple(os.path.join(app_dir, name) + os.sep for name in assets.ASSET_DIRS)
+                if any(f.startswith(asset_dirs) for f in added_or_removed):
+                    pages |= graph.get(os.path.join(app_dir, 'build.py'), set())
+            if pages:
+                engine.build_site(sorted({app_dir for app_dir, _ in pages}), only=pages, verbose=False, **options)
+                graph = dependency_graph(app_dirs)
+                signatures = snapshot(watched_files(app_dirs, graph))
+            print(f'Changed: {names} - rebuilt {len(pages)} pages in '
+                  f'{(time.perf_counter() - start) * 1000:.1f} ms, reloading\n')
+            notify_reload()
+    except KeyboardInterrupt:
+        print('\nStopped watching.')